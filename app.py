@@ -4,12 +4,34 @@ Dynamic Resume Generator - Streamlit UI (Frontend)
 Connects to the FastAPI backend to generate resumes.
 """
 
+import json
+
 import streamlit as st
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from types import MappingProxyType
 
 # API Configuration
 API_URL = "http://localhost:8000"
 
+# Pooled HTTP/2-capable client for the FastAPI backend; multiplexes
+# health checks and generate calls over a single kept-alive connection.
+_HTTPX = httpx.Client(
+    http2=True,
+    timeout=httpx.Timeout(300.0, connect=10.0),
+    limits=httpx.Limits(max_keepalive_connections=40, max_connections=100, keepalive_expiry=30.0),
+)
+
+# Shared HTTP session with keep-alive so reruns reuse the Ollama connection
+# instead of paying a TCP handshake per sidebar probe.
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=0))
+_SESSION.headers.update({
+    "Connection": "keep-alive",
+    "Accept-Encoding": "gzip, deflate",
+})
+
 # --- Constants for UI ---
 PROVIDERS = {
     "OpenAI": ["gpt-4o", "gpt-4-turbo", "gpt-3.5-turbo"],
@@ -19,6 +41,27 @@ PROVIDERS = {
     "Ollama": ["llama3", "mistral", "gemma:7b"]
 }
 
+# Map display name to internal ID (module constant — render_sidebar runs on
+# every rerun, so avoid rebuilding this dict per interaction)
+_PROVIDER_MAP = MappingProxyType({
+    "OpenAI": "openai",
+    "Anthropic": "anthropic",
+    "Google Gemini": "gemini",
+    "Groq": "groq",
+    "Ollama": "ollama"
+})
+
+# Friendly labels for the pipeline stages surfaced while streaming
+_STAGE_LABELS = MappingProxyType({
+    "parser": "Parsing template",
+    "analyzer": "Analyzing job description",
+    "analyst": "Analyzing job & planning strategy",
+    "experience_preprocessor": "Preprocessing experience",
+    "strategist": "Planning strategy",
+    "developer": "Writing LaTeX",
+    "validator": "Validating LaTeX",
+})
+
 # Page configuration
 st.set_page_config(
     page_title="Dynamic Resume Creator",
@@ -27,18 +70,39 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+_CSS = """
 <style>
     .stTextArea textarea { font-family: monospace; font-size: 12px; }
     .success-box { padding: 1rem; background-color: #d4edda; border: 1px solid #c3e6cb; border-radius: 5px; }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+@st.cache_resource
+def _inject_css():
+    """Emit the custom CSS once; cached so reruns skip re-hashing the block."""
+    st.markdown(_CSS, unsafe_allow_html=True)
 
 
-def get_ollama_models():
-    """Fetch available models from local Ollama instance."""
+DEFAULT_TEMPLATE = "\\documentclass{article}\n\\begin{document}\n% content\n\\end{document}"
+
+# Above this size, skip rendering the LaTeX inline and offer download only
+MAX_INLINE_LATEX = 50_000
+
+
+def init_session_state():
+    """Seed session-state keys so widgets bind to them instead of
+    re-shipping their full value from Python to the browser each rerun."""
+    st.session_state.setdefault("job_desc", "")
+    st.session_state.setdefault("experience", "")
+    st.session_state.setdefault("sample_latex", DEFAULT_TEMPLATE)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_ollama_models(endpoint: str = "http://localhost:11434"):
+    """Fetch available models from local Ollama instance (cached across reruns)."""
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=2)
+        response = _SESSION.get(f"{endpoint}/api/tags", timeout=2)
         if response.status_code == 200:
             models = [model["name"] for model in response.json().get("models", [])]
             return models
@@ -50,14 +114,17 @@ def get_ollama_models():
 def render_sidebar():
     st.sidebar.header("🤖 Model Settings")
 
-    # Map display name to internal ID
-    provider_map = {
-        "OpenAI": "openai",
-        "Anthropic": "anthropic",
-        "Google Gemini": "gemini",
-        "Groq": "groq",
-        "Ollama": "ollama"
-    }
+    if st.sidebar.button("🔄 Refresh Ollama models"):
+        get_ollama_models.clear()
+
+    # Streaming shows pipeline progress as it happens; the blocking request
+    # is kept as an opt-out because only it can hit the server-side
+    # whole-response cache for repeated identical inputs.
+    stream_progress = st.sidebar.checkbox(
+        "📡 Stream progress", value=True,
+        help="Render each pipeline stage as it completes instead of "
+             "waiting on the full generation."
+    )
 
     # Advanced mode toggle
     advanced_mode = st.sidebar.checkbox("🔧 Advanced: Individual Models per Agent", value=False)
@@ -66,7 +133,7 @@ def render_sidebar():
         # Simple mode: one model for all agents
         st.sidebar.subheader("Unified Model")
         provider_display = st.sidebar.selectbox("Provider", list(PROVIDERS.keys()), key="unified_provider")
-        provider_id = provider_map[provider_display]
+        provider_id = _PROVIDER_MAP[provider_display]
 
         if provider_display == "Ollama":
             available_models = get_ollama_models()
@@ -81,6 +148,7 @@ def render_sidebar():
 
         return {
             "mode": "simple",
+            "stream": stream_progress,
             "unified": {
                 "provider": provider_id,
                 "model": model,
@@ -99,7 +167,7 @@ def render_sidebar():
                 list(PROVIDERS.keys()),
                 key=f"{agent_name}_provider"
             )
-            provider_id = provider_map[provider_display]
+            provider_id = _PROVIDER_MAP[provider_display]
 
             if provider_display == "Ollama":
                 available_models = get_ollama_models()
@@ -131,18 +199,120 @@ def render_sidebar():
 
         return {
             "mode": "advanced",
+            "stream": stream_progress,
             "configs": configs
         }
 
 
+def _iter_sse(lines):
+    """Parse a Server-Sent Events line stream into (event, data) pairs."""
+    event, data_lines = "message", []
+    for line in lines:
+        if not line:
+            if data_lines:
+                yield event, "\n".join(data_lines)
+            event, data_lines = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+
+
+def _generate_streaming(payload):
+    """POST /generate_stream and render progress as events arrive.
+
+    Node completions update a status widget the moment the backend pushes
+    them, and the developer's LaTeX tokens stream into a live pane via
+    st.write_stream — so the user watches the resume being written
+    instead of staring at a spinner for the full 15-30s. Returns the
+    merged final pipeline state, or None when the server reported an
+    error.
+    """
+    state = {}
+    errors = []
+    status = st.status("Agents are working...", expanded=False)
+    live = st.empty()
+
+    with _HTTPX.stream("POST", f"{API_URL}/generate_stream", json=payload) as response:
+        if response.status_code != 200:
+            response.read()
+            status.update(label="Generation failed", state="error")
+            st.error(f"Server Error: {response.text}")
+            return None
+
+        def _token_events():
+            for event, data in _iter_sse(response.iter_lines()):
+                if event == "token":
+                    msg = json.loads(data)
+                    # Only the developer's LaTeX gets the live pane;
+                    # analysis and strategy land in the expander below
+                    if msg.get("stage") == "developer" and msg.get("delta"):
+                        yield msg["delta"]
+                elif event == "update":
+                    msg = json.loads(data)
+                    stage = msg.get("stage", "")
+                    status.update(label=f"{_STAGE_LABELS.get(stage, stage)} ✓")
+                    output = msg.get("output")
+                    if isinstance(output, dict):
+                        state.update(output)
+                elif event == "error":
+                    errors.append(json.loads(data).get("detail", "stream failed"))
+                    return
+                elif event == "done":
+                    return
+
+        with live.container():
+            st.write_stream(_token_events())
+
+    # The live pane is an unvalidated draft; the final LaTeX renders below
+    live.empty()
+
+    if errors:
+        status.update(label="Generation failed", state="error")
+        st.error(f"Server Error: {errors[0]}")
+        return None
+
+    status.update(label="Generation complete", state="complete")
+    return state
+
+
+def _render_results(data):
+    """Display a finished generation (the /generate response shape)."""
+    st.success(f"Generation Complete! (Revisions: {data['revision_count']})")
+
+    with st.expander("📊 Analysis & Strategy"):
+        st.subheader("Job Analysis")
+        st.markdown(data['analysis'])
+        st.divider()
+        st.subheader("Strategy Plan")
+        st.markdown(data['strategy'])
+
+    with st.expander("🚨 Compilation Report", expanded=not data['is_valid']):
+        if data['is_valid']:
+            st.success("LaTeX is valid (No syntax errors found).")
+        else:
+            st.error(f"Found Errors: {data['errors']}")
+
+    st.subheader("📝 Final LaTeX")
+    if len(data['final_latex']) <= MAX_INLINE_LATEX:
+        st.code(data['final_latex'], language="latex")
+    else:
+        st.info("Output is large — download it instead of rendering inline.")
+    st.download_button("Download .tex", data['final_latex'], "resume.tex")
+
+
 def main():
+    _inject_css()
+    init_session_state()
+
     st.title("📄 Dynamic Resume Creator (Agentic)")
 
     # Check Backend Health
     try:
-        requests.get(f"{API_URL}/health", timeout=1)
-    except requests.exceptions.ConnectionError:
-        st.error("⚠️ Backend API is not running. Please run `uvicorn app_server:app --reload` in a terminal.")
+        _HTTPX.head(f"{API_URL}/health", timeout=1.0)
+    except httpx.ConnectError:
+        st.error("⚠️ Backend API is not running. Please run "
+                 "`uvicorn app_server:app --loop uvloop --http httptools --reload` in a terminal.")
         st.stop()
 
     model_config = render_sidebar()
@@ -151,15 +321,14 @@ def main():
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("1. Job Description")
-        job_desc = st.text_area("Paste the job description here...", height=200)
+        job_desc = st.text_area("Paste the job description here...", height=200, key="job_desc")
 
     with col2:
         st.subheader("2. Your Experience")
-        experience = st.text_area("Paste your raw experience/CV content...", height=200)
+        experience = st.text_area("Paste your raw experience/CV content...", height=200, key="experience")
 
     st.subheader("3. Sample LaTeX (Template)")
-    sample_latex = st.text_area("Paste a working LaTeX template...", height=300,
-                                value="\\documentclass{article}\n\\begin{document}\n% content\n\\end{document}")
+    sample_latex = st.text_area("Paste a working LaTeX template...", height=300, key="sample_latex")
 
     # --- Generation ---
     if st.button("🚀 Generate Resume", type="primary"):
@@ -167,61 +336,53 @@ def main():
             st.warning("Please provide both Job Description and Experience.")
             return
 
-        with st.spinner("Agents are working... (Analyzing -> Strategizing -> Writing -> Compiling)"):
-            # Build payload based on mode
-            payload = {
-                "job_description": job_desc,
-                "raw_experience": experience,
-                "sample_latex": sample_latex,
-            }
+        # Build payload based on mode
+        payload = {
+            "job_description": job_desc,
+            "raw_experience": experience,
+            "sample_latex": sample_latex,
+        }
 
-            if model_config["mode"] == "simple":
-                # Legacy single model config
-                payload.update({
-                    "provider": model_config["unified"]["provider"],
-                    "model": model_config["unified"]["model"],
-                    "api_key": model_config["unified"]["api_key"]
+        if model_config["mode"] == "simple":
+            # Legacy single model config
+            payload.update({
+                "provider": model_config["unified"]["provider"],
+                "model": model_config["unified"]["model"],
+                "api_key": model_config["unified"]["api_key"]
+            })
+        else:
+            # Advanced mode: individual configs
+            payload.update({
+                "analyzer_config": model_config["configs"]["analyzer"],
+                "strategist_config": model_config["configs"]["strategist"],
+                "developer_config": model_config["configs"]["developer"]
+            })
+
+        try:
+            if model_config["stream"]:
+                state = _generate_streaming(payload)
+                if state is None:
+                    return
+                _render_results({
+                    "final_latex": state.get("latex_code", ""),
+                    "analysis": state.get("job_analysis", ""),
+                    "strategy": state.get("strategy_plan", ""),
+                    "is_valid": state.get("is_valid_latex", False),
+                    "errors": state.get("compilation_errors", []),
+                    "revision_count": state.get("revision_count", 0),
                 })
             else:
-                # Advanced mode: individual configs
-                payload.update({
-                    "analyzer_config": model_config["configs"]["analyzer"],
-                    "strategist_config": model_config["configs"]["strategist"],
-                    "developer_config": model_config["configs"]["developer"]
-                })
-
-            try:
-                # Increased timeout to 300s for agentic workflows
-                response = requests.post(f"{API_URL}/generate", json=payload, timeout=300)
+                with st.spinner("Agents are working... (Analyzing -> Strategizing -> Writing -> Compiling)"):
+                    # Increased timeout to 300s for agentic workflows
+                    response = _HTTPX.post(f"{API_URL}/generate", json=payload)
 
                 if response.status_code == 200:
-                    data = response.json()
-
-                    # Display Results
-                    st.success(f"Generation Complete! (Revisions: {data['revision_count']})")
-
-                    with st.expander("📊 Analysis & Strategy"):
-                        st.subheader("Job Analysis")
-                        st.markdown(data['analysis'])
-                        st.divider()
-                        st.subheader("Strategy Plan")
-                        st.markdown(data['strategy'])
-
-                    with st.expander("🚨 Compilation Report", expanded=not data['is_valid']):
-                        if data['is_valid']:
-                            st.success("LaTeX is valid (No syntax errors found).")
-                        else:
-                            st.error(f"Found Errors: {data['errors']}")
-
-                    st.subheader("📝 Final LaTeX")
-                    st.code(data['final_latex'], language="latex")
-                    st.download_button("Download .tex", data['final_latex'], "resume.tex")
-
+                    _render_results(response.json())
                 else:
                     st.error(f"Server Error: {response.text}")
 
-            except Exception as e:
-                st.error(f"Client Error: {str(e)}")
+        except Exception as e:
+            st.error(f"Client Error: {str(e)}")
 
 
 if __name__ == "__main__":
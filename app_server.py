@@ -1,12 +1,146 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from typing import Optional, List
+import asyncio
+import orjson
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import logging
+import logging.handlers
 import os
+import queue
+import signal
 
+from langchain_core.messages import HumanMessage
+
+from core import cache
 from core.graph import ResumeGraphBuilder
 from core.model_factory import ModelFactory
 
-app = FastAPI(title="Dynamic Resume Creator API")
+# Log through a queue so emission happens on a background thread instead of
+# blocking the event loop with synchronous stderr writes during error storms.
+# LOG_LEVEL=DEBUG re-enables the per-stage pipeline traces in core.graph.
+_LOG_LEVEL = os.getenv("LOG_LEVEL", "WARNING").upper()
+_log_queue = queue.Queue(-1)
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+logger = logging.getLogger("resume")
+logger.setLevel(_LOG_LEVEL)
+logger.addHandler(_queue_handler)
+# The graph and agents log under "core.*"; route them through the same queue
+_core_logger = logging.getLogger("core")
+_core_logger.setLevel(_LOG_LEVEL)
+_core_logger.addHandler(_queue_handler)
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+
+
+def _drop_model_state(signum=None, frame=None):
+    """Release memoized models, their batchers, and the compiled graphs
+    built on them, so rotated credentials take effect without a restart."""
+    ModelFactory.clear_cache()
+    _GRAPH_CACHE.clear()
+
+
+# SIGHUP drops the memoized model clients so rotated credentials take
+# effect without a restart (SIGHUP is unavailable on Windows dev boxes)
+if hasattr(signal, "SIGHUP"):
+    signal.signal(signal.SIGHUP, _drop_model_state)
+
+app = FastAPI(title="Dynamic Resume Creator API", default_response_class=ORJSONResponse)
+
+# Admission control: cap concurrent graph invocations so a burst of
+# requests can't pile up unbounded in-flight LLM calls. Model init stays
+# outside the semaphore so cheap validation failures don't hold a slot.
+# Provider API keys resolved from the environment once at import, instead
+# of rebuilding the env-var name and probing os.environ on every request
+_ENV_KEYS = {
+    p: os.environ.get(f"{p.upper()}_API_KEY")
+    for p in ("openai", "anthropic", "gemini", "groq", "ollama")
+}
+
+# Smaller models that handle the analysis/strategy stages at a fraction of
+# the latency and cost; used when the client pins only a single (developer-
+# grade) model via the legacy config. Ollama stays on the user's pick since
+# local model availability varies.
+_FAST_MODELS = {
+    "openai": "gpt-4o-mini",
+    "anthropic": "claude-3-5-haiku-20241022",
+    "gemini": "gemini-1.5-flash",
+    "groq": "llama-3.1-8b-instant",
+}
+
+# Coalesce concurrent analyzer/strategist calls into batched provider
+# requests (see core.batching); set LLM_BATCHING=0 to opt out
+LLM_BATCHING = os.getenv("LLM_BATCHING", "1") == "1"
+
+# Warm provider client + tokenizer state for this provider at startup so
+# the one-shot costs don't land on the first user's request
+DEFAULT_PROVIDER = os.getenv("DEFAULT_PROVIDER")
+WARMUP_PING = os.getenv("WARMUP_PING", "0") == "1"
+
+
+@app.on_event("startup")
+async def _warmup():
+    # Prefetch the tiktoken encoding ChatOpenAI would otherwise load lazily
+    # on the first call; harmless no-op when tiktoken isn't installed.
+    try:
+        import tiktoken
+        await asyncio.to_thread(tiktoken.encoding_for_model, "gpt-4o")
+    except Exception:
+        pass
+
+    if not DEFAULT_PROVIDER:
+        return
+
+    provider = DEFAULT_PROVIDER.lower()
+    model_name = _FAST_MODELS.get(provider)
+    if model_name is None:
+        return
+
+    try:
+        model = ModelFactory.get_model(
+            provider=provider,
+            model_name=model_name,
+            api_key=_ENV_KEYS.get(provider)
+        )
+        if WARMUP_PING:
+            # One tiny completion to open a pooled TLS connection
+            await model.ainvoke([HumanMessage("ping")], max_tokens=1)
+    except Exception as exc:
+        logger.warning("startup warmup failed: %s", exc)
+
+GENERATE_CONCURRENCY = int(os.getenv("GENERATE_CONCURRENCY", "8"))
+_GEN_SEM = asyncio.Semaphore(GENERATE_CONCURRENCY)
+_gen_in_flight = 0
+_gen_waiting = 0
+
+# Compiled graphs keyed by the identity of the (cached) model triple.
+# Model instances are memoized in ModelFactory, so their ids are stable
+# and the LangGraph compilation cost is paid once per configuration.
+# Bounded LRU like the model cache: graphs hold strong references to
+# their models, so an unbounded dict would pin every instance the
+# factory evicted and grow without limit across distinct user keys.
+_GRAPH_CACHE: OrderedDict = OrderedDict()
+_GRAPH_CACHE_MAX = 64
+
+
+def _get_graph(analyzer_model, strategist_model, developer_model):
+    key = (id(analyzer_model), id(strategist_model), id(developer_model))
+    graph = _GRAPH_CACHE.get(key)
+    if graph is None:
+        builder = ResumeGraphBuilder(
+            analyzer_model=analyzer_model,
+            strategist_model=strategist_model,
+            developer_model=developer_model
+        )
+        graph = builder.build()
+        _GRAPH_CACHE[key] = graph
+        if len(_GRAPH_CACHE) > _GRAPH_CACHE_MAX:
+            _GRAPH_CACHE.popitem(last=False)
+    else:
+        _GRAPH_CACHE.move_to_end(key)
+    return graph
 
 
 # --- Pydantic Models ---
@@ -17,10 +151,17 @@ class ModelConfig(BaseModel):
     api_key: Optional[str] = None
 
 
+# Size ceilings for the three text inputs; enforced both in the schema and
+# before model construction so oversized payloads never reach an LLM call
+MAX_JOB_DESCRIPTION = 50_000
+MAX_RAW_EXPERIENCE = 100_000
+MAX_SAMPLE_LATEX = 200_000
+
+
 class ResumeRequest(BaseModel):
-    job_description: str
-    raw_experience: str
-    sample_latex: str
+    job_description: str = Field(min_length=1, max_length=MAX_JOB_DESCRIPTION)
+    raw_experience: str = Field(min_length=1, max_length=MAX_RAW_EXPERIENCE)
+    sample_latex: str = Field(min_length=1, max_length=MAX_SAMPLE_LATEX)
 
     # Individual model configs for each agent
     analyzer_config: Optional[ModelConfig] = None
@@ -33,8 +174,13 @@ class ResumeRequest(BaseModel):
     model: Optional[str] = "gpt-4o"
     api_key: Optional[str] = None
 
-    class Config:
-        json_schema_extra = {
+    # Skip the whole-response cache for this request (e.g. to force a
+    # fresh generation with the same inputs)
+    no_cache: bool = False
+
+    model_config = ConfigDict(
+        extra="ignore",
+        json_schema_extra={
             "example": {
                 "job_description": "We need a Python dev...",
                 "raw_experience": "I have 5 years of Python...",
@@ -53,6 +199,7 @@ class ResumeRequest(BaseModel):
                 }
             }
         }
+    )
 
 
 class ResumeResponse(BaseModel):
@@ -62,97 +209,281 @@ class ResumeResponse(BaseModel):
     is_valid: bool
     errors: List[str]
     revision_count: int
+    # True when retries converged on the same errors (unfixable by the model)
+    stuck: bool = False
 
 
-# --- Routes ---
-@app.post("/generate", response_model=ResumeResponse)
-async def generate_resume(request: ResumeRequest):
+# Serialize responses through a pre-built adapter: dump_json goes straight
+# to bytes in pydantic-core, bypassing FastAPI's generic jsonable_encoder
+# pass over the (potentially large) payload.
+_RESP_ADAPTER = TypeAdapter(ResumeResponse)
+
+# Whole-pipeline response cache: identical inputs against the same model
+# configuration return the serialized response bytes in O(ms) instead of
+# re-running the 15-30 s LLM pipeline. Users commonly resubmit unchanged
+# inputs; per-request opt-out via no_cache, global via CACHE_ENABLED=0.
+_RESPONSE_CACHE = cache.TTLCache(maxsize=64, ttl=30 * 86400)
+
+
+def _response_cache_key(request: ResumeRequest) -> str:
+    configs = [
+        f"{cfg.provider}:{cfg.model}" if cfg else f"{request.provider}:{request.model}"
+        for cfg in (request.analyzer_config, request.strategist_config,
+                    request.developer_config)
+    ]
+    return cache.content_key(
+        "response",
+        *configs,
+        request.job_description,
+        request.raw_experience,
+        request.sample_latex,
+    )
+
+
+@asynccontextmanager
+async def _generation_slot():
+    """Acquire a concurrency slot, tracking queue depth for /metrics."""
+    global _gen_in_flight, _gen_waiting
+    _gen_waiting += 1
     try:
-        # Helper function to get model config
-        def get_model_config(agent_name: str, agent_config: Optional[ModelConfig]) -> tuple:
-            """Returns (provider, model_name, api_key) for an agent."""
-            if agent_config:
-                # Use agent-specific config
-                provider = agent_config.provider
-                model_name = agent_config.model
-                api_key = agent_config.api_key or os.getenv(f"{provider.upper()}_API_KEY")
-            else:
-                # Fallback to legacy single config
-                provider = request.provider
-                model_name = request.model
-                api_key = request.api_key or os.getenv(f"{provider.upper()}_API_KEY")
-
-            # Validate API key for paid providers
-            if provider in ["openai", "anthropic", "gemini", "groq"] and not api_key:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"API Key for {provider} is required for {agent_name}."
-                )
-
-            return provider, model_name, api_key
-
-        # 1. Initialize Models for each agent
-        analyzer_provider, analyzer_model_name, analyzer_api_key = get_model_config(
-            "Analyzer", request.analyzer_config
-        )
-        strategist_provider, strategist_model_name, strategist_api_key = get_model_config(
-            "Strategist", request.strategist_config
-        )
-        developer_provider, developer_model_name, developer_api_key = get_model_config(
-            "Developer", request.developer_config
+        await _GEN_SEM.acquire()
+    finally:
+        _gen_waiting -= 1
+    _gen_in_flight += 1
+    try:
+        yield
+    finally:
+        _gen_in_flight -= 1
+        _GEN_SEM.release()
+
+
+def _get_model_config(request: ResumeRequest, agent_name: str,
+                      agent_config: Optional[ModelConfig],
+                      fast_default: bool = False) -> tuple:
+    """Returns (provider, model_name, api_key) for an agent.
+
+    With fast_default=True, the legacy single-model fallback is swapped
+    for the provider's smaller model — analysis and strategy don't need
+    the developer-grade model the client pinned.
+    """
+    if agent_config:
+        # Use agent-specific config
+        provider = agent_config.provider
+        model_name = agent_config.model
+        api_key = agent_config.api_key or _ENV_KEYS.get(provider)
+    else:
+        # Fallback to legacy single config
+        provider = request.provider
+        model_name = request.model
+        if fast_default:
+            model_name = _FAST_MODELS.get(provider, model_name)
+        api_key = request.api_key or _ENV_KEYS.get(provider)
+
+    # Validate API key for paid providers
+    if provider in ["openai", "anthropic", "gemini", "groq"] and not api_key:
+        raise HTTPException(
+            status_code=400,
+            detail=f"API Key for {provider} is required for {agent_name}."
         )
 
-        analyzer_model = ModelFactory.get_model(
+    return provider, model_name, api_key
+
+
+def _validate_inputs(request: ResumeRequest) -> None:
+    """Reject blank or oversized inputs before any expensive work."""
+    for name, text, limit in (
+        ("job_description", request.job_description, MAX_JOB_DESCRIPTION),
+        ("raw_experience", request.raw_experience, MAX_RAW_EXPERIENCE),
+        ("sample_latex", request.sample_latex, MAX_SAMPLE_LATEX),
+    ):
+        if not text.strip():
+            raise HTTPException(status_code=400, detail=f"{name} must not be blank.")
+        if len(text) > limit:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{name} is too large (max {limit} characters)."
+            )
+
+
+async def _prepare_graph(request: ResumeRequest):
+    """Resolve configs, construct models, and return (graph, inputs) for a request."""
+    _validate_inputs(request)
+
+    # 1. Initialize Models for each agent
+    analyzer_provider, analyzer_model_name, analyzer_api_key = _get_model_config(
+        request, "Analyzer", request.analyzer_config, fast_default=True
+    )
+    strategist_provider, strategist_model_name, strategist_api_key = _get_model_config(
+        request, "Strategist", request.strategist_config, fast_default=True
+    )
+    developer_provider, developer_model_name, developer_api_key = _get_model_config(
+        request, "Developer", request.developer_config
+    )
+
+    # Construct the three models concurrently; each may hit the network
+    # during client setup, so overlapping them costs max() instead of sum().
+    # Analyzer and strategist calls are homogeneous across concurrent
+    # requests, so they go through the micro-batcher; developer prompts are
+    # large and heterogeneous and stay per-request.
+    analyzer_model, strategist_model, developer_model = await asyncio.gather(
+        asyncio.to_thread(
+            ModelFactory.get_model,
             provider=analyzer_provider,
             model_name=analyzer_model_name,
-            api_key=analyzer_api_key
-        )
-        strategist_model = ModelFactory.get_model(
+            api_key=analyzer_api_key,
+            batched=LLM_BATCHING
+        ),
+        asyncio.to_thread(
+            ModelFactory.get_model,
             provider=strategist_provider,
             model_name=strategist_model_name,
-            api_key=strategist_api_key
-        )
-        developer_model = ModelFactory.get_model(
+            api_key=strategist_api_key,
+            batched=LLM_BATCHING
+        ),
+        asyncio.to_thread(
+            ModelFactory.get_model,
             provider=developer_provider,
             model_name=developer_model_name,
             api_key=developer_api_key
-        )
+        ),
+    )
 
-        # 2. Build Graph with individual models
-        builder = ResumeGraphBuilder(
-            analyzer_model=analyzer_model,
-            strategist_model=strategist_model,
-            developer_model=developer_model
-        )
-        graph = builder.build()
+    # 2. Build (or reuse) the compiled graph for this model triple.
+    # Graph compilation is synchronous, so keep it off the event loop
+    # to avoid stalling other in-flight requests on a cache miss.
+    graph = await asyncio.to_thread(
+        _get_graph, analyzer_model, strategist_model, developer_model
+    )
+
+    inputs = {
+        "job_description": request.job_description,
+        "raw_experience": request.raw_experience,
+        "sample_latex": request.sample_latex,
+        "revision_count": 0,
+        "compilation_errors": []
+    }
+
+    return graph, inputs
 
-        # 3. Invoke Graph
-        inputs = {
-            "job_description": request.job_description,
-            "raw_experience": request.raw_experience,
-            "sample_latex": request.sample_latex,
-            "revision_count": 0,
-            "compilation_errors": []
-        }
+
+# --- Routes ---
+@app.post("/generate", response_model=ResumeResponse)
+async def generate_resume(request: ResumeRequest):
+    try:
+        use_cache = cache.CACHE_ENABLED and not request.no_cache
+        cache_key = _response_cache_key(request) if use_cache else None
+        if use_cache:
+            cached = _RESPONSE_CACHE.get(cache_key)
+            if cached is not None:
+                return Response(cached, media_type="application/json")
+
+        graph, inputs = await _prepare_graph(request)
 
         # Invoke (this runs the loop)
-        final_state = await graph.ainvoke(inputs)
+        async with _generation_slot():
+            final_state = await graph.ainvoke(inputs)
 
-        return ResumeResponse(
+        response = ResumeResponse(
             final_latex=final_state.get("latex_code", ""),
             analysis=final_state.get("job_analysis", ""),
             strategy=final_state.get("strategy_plan", ""),
             is_valid=final_state.get("is_valid_latex", False),
             errors=final_state.get("compilation_errors", []),
-            revision_count=final_state.get("revision_count", 0)
+            revision_count=final_state.get("revision_count", 0),
+            stuck=final_state.get("stuck", False)
         )
+        body = _RESP_ADAPTER.dump_json(response)
+        if use_cache and response.is_valid:
+            # Only successful generations are worth replaying
+            _RESPONSE_CACHE.set(cache_key, body)
+        return Response(body, media_type="application/json")
 
+    except HTTPException:
+        raise
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("generate_resume failed")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Graph nodes whose completions are forwarded as SSE updates
+_STREAM_NODES = {"parser", "analyzer", "experience_preprocessor",
+                 "strategist", "analyst", "developer", "validator"}
+
+
+@app.post("/generate_stream")
+async def generate_resume_stream(request: ResumeRequest):
+    """Stream pipeline progress to the client as Server-Sent Events.
+
+    LLM tokens are forwarded as `token` events the moment they arrive
+    (tagged with the emitting stage), and each node completion is pushed
+    as an `update` event — so the UI renders analysis -> strategy ->
+    LaTeX progressively instead of waiting on the full pipeline.
+    """
+    graph, inputs = await _prepare_graph(request)
+
+    async def event_generator():
+        try:
+            async with _generation_slot():
+                async for event in graph.astream_events(inputs, version="v2"):
+                    kind = event["event"]
+                    stage = event.get("metadata", {}).get("langgraph_node", "")
+
+                    if kind == "on_chat_model_stream":
+                        delta = getattr(event["data"].get("chunk"), "content", "") or ""
+                        if delta:
+                            payload = orjson.dumps({"stage": stage, "delta": delta}).decode()
+                            yield f"event: token\ndata: {payload}\n\n"
+
+                    elif kind == "on_chain_end" and event.get("name") in _STREAM_NODES:
+                        payload = orjson.dumps(
+                            {"stage": event["name"], "output": event["data"].get("output")},
+                            default=str
+                        ).decode()
+                        yield f"event: update\ndata: {payload}\n\n"
+            yield "event: done\ndata: {}\n\n"
+        except Exception as e:
+            logger.exception("generate_resume_stream failed")
+            payload = orjson.dumps({"detail": str(e)}).decode()
+            yield f"event: error\ndata: {payload}\n\n"
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+
+# The health payload never changes, so a fixed ETag lets clients revalidate
+# with a body-less 304 instead of re-downloading the JSON every rerun.
+_HEALTH_ETAG = '"ok-v1"'
+_HEALTH_HEADERS = {"ETag": _HEALTH_ETAG, "Cache-Control": "max-age=5"}
+
+
 @app.get("/health")
-def health():
-    return {"status": "ok"}
+def health(request: Request):
+    if request.headers.get("if-none-match") == _HEALTH_ETAG:
+        return Response(status_code=304, headers=_HEALTH_HEADERS)
+    return Response(
+        content=b'{"status":"ok"}',
+        media_type="application/json",
+        headers=_HEALTH_HEADERS,
+    )
+
+
+@app.head("/health")
+def health_head():
+    # Body-less liveness probe: no JSON to serialize or parse on either side
+    return Response(status_code=200)
+
+
+@app.post("/cache/clear")
+def clear_caches():
+    """Drop the whole-response and per-agent LLM caches."""
+    _RESPONSE_CACHE.clear()
+    cache.llm_cache.clear()
+    return {"status": "cleared"}
+
+
+@app.get("/metrics")
+def metrics():
+    return {
+        "generate_concurrency_limit": GENERATE_CONCURRENCY,
+        "generate_in_flight": _gen_in_flight,
+        "generate_waiting": _gen_waiting,
+    }
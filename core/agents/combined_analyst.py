@@ -0,0 +1,84 @@
+import os
+import re
+from typing import Tuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.prompts import ChatPromptTemplate
+
+from core import cache
+
+# Fuse the analyzer and strategist stages into one LLM round-trip;
+# the split agents remain the default for debugging and quality comparison.
+FUSE_AGENTS = os.getenv("FUSE_AGENTS", "0") == "1"
+
+_SYSTEM_PROMPT = (
+    "You are both an expert Talent Acquisition Specialist and a Senior Resume"
+    "Strategist. Produce TWO sections in one response, in this exact order,"
+    "each preceded by its delimiter on its own line:"
+    "---ANALYSIS---"
+    "Extract the critical signal from the job description:"
+    "1. CORE SKILLS: The top 3-5 hard skills absolutely required."
+    "2. KEYWORDS: Specific terminology, tools, or buzzwords the ATS will search for."
+    "3. HIDDEN NEEDS: What is the underlying problem they are hiring to solve?"
+    "4. CULTURE VIBE: The tone of the company."
+    "---STRATEGY---"
+    "Using that analysis and the candidate's experience, write a content"
+    "strategy for the resume (do NOT write the resume itself):"
+    "1. SUMMARY STRATEGY: Which 2-3 key strengths to highlight."
+    "2. EXPERIENCE SELECTION: Which roles/projects to feature or minimize."
+    "3. BULLET POINT ANGLES: How to frame achievements against the analysis."
+    "4. KEYWORD INTEGRATION: Which keywords must be woven into bullet points."
+    "Be specific and tactical. Output nothing outside the two sections."
+)
+
+_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("system", _SYSTEM_PROMPT),
+        (
+            "human",
+            """
+            JOB DESCRIPTION:
+            {job_description}
+
+            CANDIDATE EXPERIENCE:
+            {experience}
+            """,
+        ),
+    ]
+)
+
+_SECTION_RE = re.compile(
+    r"---ANALYSIS---\s*(.*?)\s*---STRATEGY---\s*(.*)", re.DOTALL
+)
+
+
+class CombinedAnalystAgent:
+    def __init__(self, model: BaseChatModel):
+        self.model = model
+        # Chain is fixed per agent instance; building it per call wastes work
+        self.chain = _PROMPT | model
+
+    async def analyze_and_plan(self, job_description: str, experience: str) -> Tuple[str, str]:
+        key = cache.content_key(
+            "analyst", cache.model_id(self.model), job_description, experience
+        )
+        if cache.CACHE_ENABLED:
+            cached = cache.llm_cache.get(key)
+            if cached is not None:
+                return cached
+
+        response = await self.chain.ainvoke(
+            {"job_description": job_description, "experience": experience}
+        )
+
+        match = _SECTION_RE.search(response.content)
+        if match:
+            result = (match.group(1), match.group(2))
+        else:
+            # Delimiters missing — feed the whole response to both consumers
+            # rather than failing the pipeline
+            result = (response.content, response.content)
+
+        if cache.CACHE_ENABLED:
+            cache.llm_cache.set(key, result)
+        return result
@@ -1,26 +1,15 @@
+import re
+
 from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
 from core.tools.template_parser import TemplateParser
+from core.tools import prompt_compress
 
+__all__ = ["LatexDeveloperAgent"]
 
-class LatexDeveloperAgent:
-    def __init__(self, model: BaseChatModel):
-        self.model = model
-
-    async def build_resume(
-        self,
-        job_analysis: str,
-        strategy: str,
-        sample_latex: str,
-        experience: str,
-        template_preamble: str,
-        template_body: str,
-        command_cheatsheet: str,
-        previous_errors: list = None
-    ) -> str:
-        system_prompt = """You are an expert Resume Content Writer.
+_SYSTEM_PROMPT = """You are an expert Resume Content Writer.
 
 Your job is to generate ONLY the document body of a LaTeX resume.
 The preamble (packages, commands, settings) is handled separately — you must NOT produce it.
@@ -37,45 +26,96 @@ RULES:
 
 {command_cheatsheet}"""
 
-        user_prompt_parts = [
-            "JOB REQUIREMENTS ANALYSIS:",
-            "{job_analysis}",
-            "",
-            "CONTENT STRATEGY (What to emphasize):",
-            "{strategy}",
-            "",
-            "SAMPLE BODY (Use this structure as reference — replace content only):",
-            "{template_body}",
-            "",
-            "CANDIDATE'S RAW EXPERIENCE (Content source):",
-            "{experience}",
-            ""
+# Section ordering matters for provider-side prompt caching: everything here
+# is stable across retries, so it forms the shared prefix. The biggest
+# sections (template body, experience) lead so that resubmissions of the same
+# template/CV also reuse cache across requests. The retry-variable error
+# feedback is appended strictly AFTER this block — never in the middle —
+# keeping the prefix byte-identical between attempt 1 and the retries.
+_USER_PROMPT_STATIC = (
+    "SAMPLE BODY (Use this structure as reference — replace content only):",
+    "{template_body}",
+    "",
+    "CANDIDATE'S RAW EXPERIENCE (Content source):",
+    "{experience}",
+    "",
+    "JOB REQUIREMENTS ANALYSIS:",
+    "{job_analysis}",
+    "",
+    "CONTENT STRATEGY (What to emphasize):",
+    "{strategy}",
+    "",
+    "Generate the resume body content now.",
+    "Use the custom commands from the cheatsheet.",
+    "Follow the sample body structure.",
+    "Output ONLY the LaTeX body — no preamble, no \\begin{{document}}, no \\end{{document}}."
+)
+
+_ERROR_SECTION = (
+    "",
+    "PREVIOUS ATTEMPT FAILED — FIX THESE ERRORS:",
+    "{error_feedback}",
+    "",
+    "Fix every error above and regenerate the body now.",
+)
+
+
+def _build_prompt(with_errors: bool) -> ChatPromptTemplate:
+    parts = _USER_PROMPT_STATIC + (_ERROR_SECTION if with_errors else ())
+    return ChatPromptTemplate.from_messages(
+        [
+            ("system", _SYSTEM_PROMPT),
+            ("human", "\n".join(parts)),
         ]
+    )
 
-        if previous_errors:
-            user_prompt_parts.extend([
-                "PREVIOUS ATTEMPT FAILED — FIX THESE ERRORS:",
-                "{error_feedback}",
-                "",
-            ])
-
-        user_prompt_parts.extend([
-            "Generate the resume body content now.",
-            "Use the custom commands from the cheatsheet.",
-            "Follow the sample body structure.",
-            "Output ONLY the LaTeX body — no preamble, no \\begin{{document}}, no \\end{{document}}."
-        ])
-
-        user_prompt = "\n".join(user_prompt_parts)
-
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                ("system", system_prompt),
-                ("human", user_prompt),
-            ]
-        )
-
-        chain = prompt | self.model | StrOutputParser()
+
+_PROMPT = _build_prompt(with_errors=False)
+_PROMPT_WITH_ERRORS = _build_prompt(with_errors=True)
+
+# Markdown fences the LLM sometimes wraps its output in
+_FENCE_RE = re.compile(r"```(?:latex)?")
+
+# Extracts the document body in a single scan: either the span between
+# \begin{document} and \end{document} (or end-of-string), or — when only a
+# stray \end{document} is present — everything before it.
+_BODY_RE = re.compile(
+    r"\\begin\{document\}(.*?)(?:\\end\{document\}|\Z)"
+    r"|\A(?!.*\\begin\{document\})(.*?)\\end\{document\}",
+    re.DOTALL,
+)
+
+# First recognizable body command, used to skip accidentally-included preamble
+_BODY_START_RE = re.compile(r"\\begin\{center\}|\\section|\\resumeSubHeadingListStart")
+
+
+class LatexDeveloperAgent:
+    def __init__(self, model: BaseChatModel):
+        self.model = model
+        # Both prompt variants are fixed for the agent's lifetime; prebuilding
+        # the chains keeps retries from re-parsing the templates every call
+        self._chain = _PROMPT | model | StrOutputParser()
+        self._chain_with_errors = _PROMPT_WITH_ERRORS | model | StrOutputParser()
+
+    async def build_resume(
+        self,
+        job_analysis: str,
+        strategy: str,
+        sample_latex: str,
+        experience: str,
+        template_preamble: str,
+        template_body: str,
+        command_cheatsheet: str,
+        previous_errors: list = None
+    ) -> str:
+        if prompt_compress.COMPRESS_PROMPT:
+            # Shrink the prompt's bulkiest sections before every call —
+            # on retries the savings compound
+            template_body = prompt_compress.compress_latex(template_body)
+            command_cheatsheet = prompt_compress.compress_latex(command_cheatsheet)
+            experience = prompt_compress.compress_prose(experience)
+
+        chain = self._chain_with_errors if previous_errors else self._chain
 
         invoke_params = {
             "job_analysis": job_analysis,
@@ -100,27 +140,17 @@ RULES:
     @staticmethod
     def _clean_body(raw: str) -> str:
         """Clean LLM output to extract just the body content."""
-        clean = raw.replace("```latex", "").replace("```", "").strip()
-
-        # If the LLM accidentally included preamble, extract just the body
-        begin_marker = r"\begin{document}"
-        end_marker = r"\end{document}"
-
-        if begin_marker in clean:
-            start = clean.find(begin_marker) + len(begin_marker)
-            clean = clean[start:]
+        clean = _FENCE_RE.sub("", raw).strip()
 
-        if end_marker in clean:
-            end = clean.find(end_marker)
-            clean = clean[:end]
+        # If the LLM accidentally included document markers, extract the body
+        match = _BODY_RE.search(clean)
+        if match:
+            clean = match.group(1) if match.group(1) is not None else match.group(2)
 
         # Strip \documentclass and everything before first real content
         if "\\documentclass" in clean:
-            # Find first section or center or other body command
-            for marker in ["\\begin{center}", "\\section", "\\resumeSubHeadingListStart"]:
-                idx = clean.find(marker)
-                if idx != -1:
-                    clean = clean[idx:]
-                    break
+            start = _BODY_START_RE.search(clean)
+            if start:
+                clean = clean[start.start():]
 
         return clean.strip()
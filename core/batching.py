@@ -0,0 +1,108 @@
+"""
+LLM Micro-Batching
+
+Coalesces concurrent calls against the same chat model into a single
+`abatch` provider request. When several /generate requests are in flight,
+their analyzer/strategist calls land within the same short window and are
+issued as one batched API call instead of N independent round-trips.
+"""
+
+import asyncio
+import os
+from collections import OrderedDict
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import RunnableLambda
+
+# Batch at most this many prompts per provider call
+MAX_BATCH = int(os.getenv("LLM_MAX_BATCH", "8"))
+
+# How long to wait for more prompts to arrive before flushing a batch
+BATCH_WINDOW_MS = int(os.getenv("LLM_BATCH_WINDOW_MS", "20"))
+
+# Idle time after which a batcher's consumer task shuts down
+_IDLE_TIMEOUT_S = 5.0
+
+# Batchers hold strong references to their models, so the registry is a
+# bounded LRU sized like ModelFactory's cache — otherwise entries for
+# models the factory already evicted would stay pinned forever
+_MAX_INSTANCES = 64
+
+
+class MicroBatcher:
+    """Per-model queue that drains concurrent prompts into abatch calls."""
+
+    _instances: "OrderedDict[int, MicroBatcher]" = OrderedDict()
+
+    def __init__(self, model: BaseChatModel):
+        self.model = model
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._consumer = None
+
+    @classmethod
+    def for_model(cls, model: BaseChatModel) -> "MicroBatcher":
+        """Return the shared batcher for a (cached) model instance."""
+        batcher = cls._instances.get(id(model))
+        if batcher is None:
+            batcher = cls(model)
+            cls._instances[id(model)] = batcher
+            if len(cls._instances) > _MAX_INSTANCES:
+                cls._instances.popitem(last=False)
+        else:
+            cls._instances.move_to_end(id(model))
+        return batcher
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop every shared batcher (paired with a model-cache clear)."""
+        cls._instances.clear()
+
+    async def submit(self, prompt_value):
+        """Enqueue one prompt and await its result from the next batch."""
+        loop = asyncio.get_running_loop()
+        if self._consumer is None or self._consumer.done():
+            self._consumer = loop.create_task(self._consume())
+        future = loop.create_future()
+        await self.queue.put((prompt_value, future))
+        return await future
+
+    async def _consume(self):
+        while True:
+            try:
+                batch = [await asyncio.wait_for(self.queue.get(), timeout=_IDLE_TIMEOUT_S)]
+            except asyncio.TimeoutError:
+                return  # idle; a later submit restarts the consumer
+
+            # Collect more prompts until the batch is full or the window closes
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(
+                        await asyncio.wait_for(self.queue.get(), timeout=BATCH_WINDOW_MS / 1000)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            prompts = [prompt for prompt, _ in batch]
+            try:
+                results = await self.model.abatch(prompts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+
+
+def wrap_batched(model: BaseChatModel):
+    """Wrap a chat model so chain invocations route through its batcher.
+
+    The returned runnable drops into `prompt | model` pipelines unchanged;
+    each ainvoke becomes a submit() against the shared per-model queue.
+    """
+    batcher = MicroBatcher.for_model(model)
+    wrapper = RunnableLambda(batcher.submit)
+    # Preserve the wrapped model's identity for cache keys (see core.cache.model_id)
+    wrapper.model_name = getattr(model, "model_name", None) or getattr(model, "model", "")
+    return wrapper
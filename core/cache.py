@@ -0,0 +1,69 @@
+"""
+LLM Output Cache
+
+Small in-process TTL cache for agent outputs that are pure functions of
+their text inputs (job analysis, strategy plans). Keys are content hashes,
+so repeat submissions of the same job description or experience skip the
+LLM round-trip entirely. Disable with CACHE_ENABLED=0.
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "1") == "1"
+
+# Agent outputs stay useful for a while; a week matches how long a given
+# job posting / CV pairing tends to be iterated on.
+DEFAULT_TTL = 7 * 86400
+
+
+def content_key(*parts: str) -> str:
+    """Hash an ordered sequence of text parts into a cache key."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")  # separator so ("ab","c") != ("a","bc")
+    return h.hexdigest()
+
+
+def model_id(model: Any) -> str:
+    """Stable identifier for a chat model, for inclusion in cache keys."""
+    name = getattr(model, "model_name", None) or getattr(model, "model", "")
+    return f"{type(model).__name__}:{name}"
+
+
+class TTLCache:
+    """LRU cache with per-entry expiry. Not thread-safe; intended for use
+    from the single event loop (dict ops are atomic under the GIL anyway)."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = DEFAULT_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if time.monotonic() > expires:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Shared cache for agent LLM outputs
+llm_cache = TTLCache()
@@ -1,3 +1,7 @@
+import asyncio
+import hashlib
+import logging
+import re
 from typing import Dict
 from langgraph.graph import StateGraph, END
 from langchain_core.language_models import BaseChatModel
@@ -6,9 +10,19 @@ from core.state import ResumeState
 from core.agents.analyzer import JobAnalyzerAgent
 from core.agents.strategist import StrategyAgent
 from core.agents.developer import LatexDeveloperAgent
+from core.agents import combined_analyst
+from core.agents.combined_analyst import CombinedAnalystAgent
 from core.tools.latex_validator import LatexValidator
 from core.tools.template_verifier import TemplateVerifier
 from core.tools.template_parser import TemplateParser
+from core.tools import experience_filter
+
+__all__ = ["ResumeGraphBuilder"]
+
+# Stage traces are debug-level: with the default WARNING threshold the
+# lazy %-style arguments are never formatted and nothing hits stdout,
+# so concurrent requests don't serialize on the stream lock.
+logger = logging.getLogger(__name__)
 
 
 class ResumeGraphBuilder:
@@ -28,6 +42,9 @@ class ResumeGraphBuilder:
         """
         self.analyzer = JobAnalyzerAgent(analyzer_model)
         self.strategist = StrategyAgent(strategist_model)
+        # One-round-trip replacement for analyzer + strategist (FUSE_AGENTS=1);
+        # runs on the strategist's model since that stage needs the reasoning
+        self.analyst = CombinedAnalystAgent(strategist_model)
         self.developer = LatexDeveloperAgent(developer_model)
         self.validator = LatexValidator()
         self.template_verifier = TemplateVerifier()
@@ -37,9 +54,12 @@ class ResumeGraphBuilder:
         workflow = StateGraph(ResumeState)
 
         # --- NODES ---
-        def parser_node(state: ResumeState) -> Dict:
-            print("--- PARSING TEMPLATE ---")
-            parsed = self.template_parser.parse(state["sample_latex"])
+        async def parser_node(state: ResumeState) -> Dict:
+            logger.debug("--- PARSING TEMPLATE ---")
+            # Regex-heavy on large templates; keep it off the event loop
+            parsed = await asyncio.to_thread(
+                self.template_parser.parse, state["sample_latex"]
+            )
             return {
                 "template_preamble": parsed["preamble"],
                 "template_body": parsed["body"],
@@ -47,33 +67,59 @@ class ResumeGraphBuilder:
             }
 
         async def analyze_node(state: ResumeState) -> Dict:
-            print("--- ANALYZING ---")
+            logger.debug("--- ANALYZING ---")
             analysis = await self.analyzer.analyze(state["job_description"])
             return {"job_analysis": analysis}
 
+        def preprocess_experience_node(state: ResumeState) -> Dict:
+            # Cheap normalization that runs alongside the analyzer's LLM call:
+            # strip trailing whitespace and collapse blank-line runs so the
+            # strategist gets a tidier (and slightly smaller) input.
+            logger.debug("--- PREPROCESSING EXPERIENCE ---")
+            cleaned = re.sub(r"[ \t]+$", "", state["raw_experience"], flags=re.M)
+            cleaned = re.sub(r"\n{3,}", "\n\n", cleaned).strip()
+            return {"processed_experience": cleaned}
+
         async def strategy_node(state: ResumeState) -> Dict:
-            print("--- STRATEGIZING ---")
+            logger.debug("--- STRATEGIZING ---")
             strategy = await self.strategist.plan(
                 state["job_analysis"],
-                state["raw_experience"]
+                state.get("processed_experience") or state["raw_experience"]
             )
             return {"strategy_plan": strategy}
 
+        async def analyst_node(state: ResumeState) -> Dict:
+            # Fused analyzer + strategist: one LLM round-trip produces both
+            # outputs, trading stage isolation for a full saved network RTT
+            logger.debug("--- ANALYZING + STRATEGIZING (fused) ---")
+            analysis, strategy = await self.analyst.analyze_and_plan(
+                state["job_description"], state["raw_experience"]
+            )
+            return {"job_analysis": analysis, "strategy_plan": strategy}
+
         async def developer_node(state: ResumeState) -> Dict:
             revision = state.get("revision_count", 0) + 1
-            print(f"--- DEVELOPING (Attempt {revision}) ---")
+            logger.debug("--- DEVELOPING (attempt %d) ---", revision)
 
             # Pass previous errors if this is a retry
             previous_errors = state.get("compilation_errors", []) if revision > 1 else None
 
             if previous_errors:
-                print(f"⚠️  Retry with {len(previous_errors)} previous errors")
+                logger.debug("retrying with %d previous errors", len(previous_errors))
+
+            experience = state.get("processed_experience") or state["raw_experience"]
+            if experience_filter.FILTER_EXPERIENCE:
+                # Drop experience sentences irrelevant to the job analysis
+                # before they burn developer-prompt tokens (opt-in)
+                experience = experience_filter.filter_experience(
+                    experience, state["job_analysis"]
+                )
 
             code = await self.developer.build_resume(
                 job_analysis=state["job_analysis"],
                 strategy=state["strategy_plan"],
                 sample_latex=state["sample_latex"],
-                experience=state["raw_experience"],
+                experience=experience,
                 template_preamble=state["template_preamble"],
                 template_body=state["template_body"],
                 command_cheatsheet=state["command_cheatsheet"],
@@ -81,16 +127,21 @@ class ResumeGraphBuilder:
             )
             return {"latex_code": code, "revision_count": revision}
 
-        def validator_node(state: ResumeState) -> Dict:
-            print("--- VALIDATING ---")
+        async def validator_node(state: ResumeState) -> Dict:
+            logger.debug("--- VALIDATING ---")
             errors = []
 
+            # Both checks scan the full generated LaTeX with regexes; run
+            # them on worker threads so concurrent requests keep moving.
             # 1. Syntax validation
-            is_syntax_valid, syntax_errors = self.validator.validate(state["latex_code"])
+            is_syntax_valid, syntax_errors = await asyncio.to_thread(
+                self.validator.validate, state["latex_code"]
+            )
             errors.extend(syntax_errors)
 
             # 2. Template preservation (lightweight: document class + boundaries)
-            is_template_valid, template_issues = self.template_verifier.verify_template_preservation(
+            is_template_valid, template_issues = await asyncio.to_thread(
+                self.template_verifier.verify_template_preservation,
                 state["sample_latex"],
                 state["latex_code"]
             )
@@ -99,38 +150,68 @@ class ResumeGraphBuilder:
             is_valid = is_syntax_valid and is_template_valid
 
             if not is_valid:
-                print(f"⚠️  Validation failed: {len(errors)} issues")
+                logger.warning("validation failed: %d issues", len(errors))
+
+            # Fingerprint this revision's errors; if a retry reproduces the
+            # exact same set, the model isn't self-correcting and another
+            # developer call would be wasted.
+            error_hash = hashlib.blake2b("\n".join(sorted(errors)).encode()).hexdigest()
+            stuck = (
+                not is_valid
+                and state.get("prev_error_hash") is not None
+                and error_hash == state.get("prev_error_hash")
+            )
 
             return {
                 "is_valid_latex": is_valid,
-                "compilation_errors": errors
+                "compilation_errors": errors,
+                "prev_error_hash": error_hash,
+                "stuck": stuck
             }
 
         # --- GRAPH CONSTRUCTION ---
         workflow.add_node("parser", parser_node)
-        workflow.add_node("analyzer", analyze_node)
-        workflow.add_node("strategist", strategy_node)
+        workflow.add_node("experience_preprocessor", preprocess_experience_node)
         workflow.add_node("developer", developer_node)
         workflow.add_node("validator", validator_node)
 
         # --- EDGES ---
         workflow.set_entry_point("parser")
-        workflow.add_edge("parser", "analyzer")
-        workflow.add_edge("analyzer", "strategist")
-        workflow.add_edge("strategist", "developer")
+        workflow.add_edge("parser", "experience_preprocessor")
+
+        if combined_analyst.FUSE_AGENTS:
+            # Single fused stage in place of analyzer + strategist; it runs
+            # alongside the preprocessor and the developer joins on both.
+            workflow.add_node("analyst", analyst_node)
+            workflow.add_edge("parser", "analyst")
+            workflow.add_edge(["analyst", "experience_preprocessor"], "developer")
+        else:
+            # The analyzer (LLM round-trip) and experience preprocessing are
+            # independent, so they fan out from the parser and run
+            # concurrently; the strategist joins on both branches.
+            workflow.add_node("analyzer", analyze_node)
+            workflow.add_node("strategist", strategy_node)
+            workflow.add_edge("parser", "analyzer")
+            workflow.add_edge(["analyzer", "experience_preprocessor"], "strategist")
+            workflow.add_edge("strategist", "developer")
+
         workflow.add_edge("developer", "validator")
 
         # --- CONDITIONAL EDGE (The Loop) ---
         def should_continue(state: ResumeState):
             if state["is_valid_latex"]:
-                print("--- DONE: VALID LATEX ---")
+                logger.debug("--- DONE: VALID LATEX ---")
+                return END
+
+            if state.get("stuck"):
+                logger.debug("--- DONE: STUCK ON SAME ERRORS ---")
                 return END
 
             if state["revision_count"] >= 3:
-                print("--- DONE: MAX RETRIES REACHED ---")
+                logger.debug("--- DONE: MAX RETRIES REACHED ---")
                 return END
 
-            print(f"--- RETRYING (Errors: {state['compilation_errors']}) ---")
+            logger.debug("--- RETRYING (%d errors) ---", len(state["compilation_errors"]))
             return "developer"
 
         workflow.add_conditional_edges(
@@ -1,3 +1,6 @@
+import hashlib
+import httpx
+from collections import OrderedDict
 from typing import Optional
 from langchain_core.language_models import BaseChatModel
 from langchain_openai import ChatOpenAI
@@ -6,6 +9,29 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_groq import ChatGroq
 from langchain_ollama import ChatOllama
 
+# Memoized model instances keyed by (provider, model, api_key_hash, temperature).
+# Provider clients own connection pools and tokenizer state, so reusing them
+# across requests avoids repeated TLS handshakes and warm-up work.
+# The API key is hashed so the cache key never holds it in plaintext.
+# Bounded LRU so many distinct user-supplied keys can't grow it without limit.
+_MODEL_CACHE: "OrderedDict[tuple, BaseChatModel]" = OrderedDict()
+_MODEL_CACHE_MAX = 64
+
+# One HTTP/2 client shared by every model instance that accepts an external
+# transport, so the three agent calls within a request (and calls across
+# requests) multiplex over pooled keep-alive connections instead of each
+# wrapper owning its own TCP+TLS session.
+_HTTP_CLIENT = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    timeout=60.0,
+)
+
+
+def _cache_key(provider: str, model_name: str, api_key: Optional[str], temperature: float) -> tuple:
+    key_hash = hashlib.sha256(api_key.encode()).hexdigest() if api_key else None
+    return (provider, model_name, key_hash, temperature)
+
 
 class ModelFactory:
     @staticmethod
@@ -13,18 +39,75 @@ class ModelFactory:
         provider: str,
         model_name: str,
         api_key: Optional[str] = None,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        batched: bool = False
     ) -> BaseChatModel:
         """
         Factory to return a LangChain ChatModel based on provider.
+
+        Identical (provider, model, api_key, temperature) configs return
+        the same cached instance, so its connection pool is reused.
+
+        With batched=True the model is wrapped so concurrent invocations
+        are coalesced into single abatch provider calls (see core.batching).
         """
         provider = provider.lower()
 
+        key = _cache_key(provider, model_name, api_key, temperature)
+        model = ModelFactory._cache_lookup(key)
+        if model is None:
+            model = ModelFactory._build_model(provider, model_name, api_key, temperature)
+            ModelFactory._cache_store(key, model)
+
+        if batched:
+            from core.batching import wrap_batched
+            batched_key = key + ("batched",)
+            wrapped = ModelFactory._cache_lookup(batched_key)
+            if wrapped is None:
+                wrapped = wrap_batched(model)
+                ModelFactory._cache_store(batched_key, wrapped)
+            return wrapped
+
+        return model
+
+    @staticmethod
+    def _cache_lookup(key: tuple) -> Optional[BaseChatModel]:
+        model = _MODEL_CACHE.get(key)
+        if model is not None:
+            _MODEL_CACHE.move_to_end(key)
+        return model
+
+    @staticmethod
+    def _cache_store(key: tuple, model: BaseChatModel) -> None:
+        _MODEL_CACHE[key] = model
+        if len(_MODEL_CACHE) > _MODEL_CACHE_MAX:
+            _MODEL_CACHE.popitem(last=False)
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop every cached model, e.g. after credential rotation.
+
+        Batchers reference models directly, so they are dropped too —
+        otherwise they would keep the evicted instances alive.
+        """
+        _MODEL_CACHE.clear()
+        from core.batching import MicroBatcher
+        MicroBatcher.clear()
+
+    @staticmethod
+    def _build_model(
+        provider: str,
+        model_name: str,
+        api_key: Optional[str],
+        temperature: float
+    ) -> BaseChatModel:
+
         if provider == "openai":
             return ChatOpenAI(
                 model=model_name,
                 api_key=api_key,
-                temperature=temperature
+                temperature=temperature,
+                http_async_client=_HTTP_CLIENT
             )
 
         elif provider == "anthropic":
@@ -34,71 +34,137 @@ CREATIVITY_LEVELS = {
 }
 
 
+# Flat temperature lookup so hot paths skip the nested dict access
+TEMPERATURES = {level: cfg["temperature"] for level, cfg in CREATIVITY_LEVELS.items()}
+
+_BASE_INSTRUCTIONS = (
+    "You are an expert resume writer and career coach with deep knowledge of"
+    "ATS (Applicant Tracking Systems) and hiring practices."
+    "Your task is to generate a tailored LaTeX resume based on:"
+    "1. A sample LaTeX resume (which defines the style and structure to follow)"
+    "2. The candidate's experience and background"
+    "3. A target job description"
+    "CRITICAL RULES:"
+    "- Output ONLY valid LaTeX code that can be compiled directly"
+    "- Do NOT include any explanations, markdown, or text outside the LaTeX"
+    "- Do NOT wrap the output in ```latex``` code blocks"
+    "- Preserve the exact LaTeX structure, packages, and formatting from the sample"
+    "- The output should compile without errors in Overleaf or any LaTeX compiler"
+)
+
+_CREATIVITY_INSTRUCTIONS = {
+    1: (
+        "CONSERVATIVE MODE:"
+        "- Only select and reorganize existing experience points that match the job"
+        "- Make minimal text changes - mostly structural reorganization"
+        "- Keep original wording as much as possible"
+        "- Prioritize relevant experiences at the top"
+        "- Remove irrelevant experiences if space is needed"
+    ),
+    2: (
+        "MODERATE MODE:"
+        "- Reorganize content to highlight relevant experience"
+        "- Lightly reword bullet points to incorporate keywords from the job description"
+        "- Keep the essence of original experiences intact"
+        "- Adjust emphasis without changing facts"
+        "- Mirror terminology used in the job posting"
+    ),
+    3: (
+        "BALANCED MODE:"
+        "- Actively tailor each bullet point to resonate with the job requirements"
+        "- Rewrite content to emphasize relevant skills and achievements"
+        "- Add context that connects experience to job requirements"
+        "- Quantify achievements where possible"
+        "- Maintain truthfulness while optimizing presentation"
+    ),
+    4: (
+        "CREATIVE MODE:"
+        "- Significantly rewrite bullet points to maximize relevance"
+        "- Highlight transferable skills even if not directly mentioned"
+        "- Reframe experiences to align with job requirements"
+        "- Create stronger connections between past work and target role"
+        "- Use powerful action verbs and impactful language"
+    ),
+    5: (
+        "BOLD MODE:"
+        "- Maximum adaptation to match the job description"
+        "- Infer and articulate implied skills from the experience"
+        "- Creatively connect seemingly unrelated experiences to job requirements"
+        "- Craft compelling narratives that position the candidate as ideal"
+        "- Push the boundaries while staying within truthful bounds"
+        "- Make the resume impossible to ignore"
+    ),
+}
+
+# The five final system prompts never change, so assemble them once at
+# import instead of re-concatenating per generation
+_SYSTEM_PROMPTS = {
+    level: _BASE_INSTRUCTIONS + instructions
+    for level, instructions in _CREATIVITY_INSTRUCTIONS.items()
+}
+
+
 def get_system_prompt(creativity_level: int) -> str:
     """Get the system prompt based on creativity level."""
+    return _SYSTEM_PROMPTS.get(creativity_level, _SYSTEM_PROMPTS[3])
 
-    base_instructions = (
-        "You are an expert resume writer and career coach with deep knowledge of"
-        "ATS (Applicant Tracking Systems) and hiring practices."
-        "Your task is to generate a tailored LaTeX resume based on:"
-        "1. A sample LaTeX resume (which defines the style and structure to follow)"
-        "2. The candidate's experience and background"
-        "3. A target job description"
-        "CRITICAL RULES:"
-        "- Output ONLY valid LaTeX code that can be compiled directly"
-        "- Do NOT include any explanations, markdown, or text outside the LaTeX"
-        "- Do NOT wrap the output in ```latex``` code blocks"
-        "- Preserve the exact LaTeX structure, packages, and formatting from the sample"
-        "- The output should compile without errors in Overleaf or any LaTeX compiler"
-    )
 
-    creativity_instructions = {
-        1: (
-            "CONSERVATIVE MODE:"
-            "- Only select and reorganize existing experience points that match the job"
-            "- Make minimal text changes - mostly structural reorganization"
-            "- Keep original wording as much as possible"
-            "- Prioritize relevant experiences at the top"
-            "- Remove irrelevant experiences if space is needed"
-        ),
-        2: (
-            "MODERATE MODE:"
-            "- Reorganize content to highlight relevant experience"
-            "- Lightly reword bullet points to incorporate keywords from the job description"
-            "- Keep the essence of original experiences intact"
-            "- Adjust emphasis without changing facts"
-            "- Mirror terminology used in the job posting"
-        ),
-        3: (
-            "BALANCED MODE:"
-            "- Actively tailor each bullet point to resonate with the job requirements"
-            "- Rewrite content to emphasize relevant skills and achievements"
-            "- Add context that connects experience to job requirements"
-            "- Quantify achievements where possible"
-            "- Maintain truthfulness while optimizing presentation"
-        ),
-        4: (
-            "CREATIVE MODE:"
-            "- Significantly rewrite bullet points to maximize relevance"
-            "- Highlight transferable skills even if not directly mentioned"
-            "- Reframe experiences to align with job requirements"
-            "- Create stronger connections between past work and target role"
-            "- Use powerful action verbs and impactful language"
-        ),
-        5: (
-            "BOLD MODE:"
-            "- Maximum adaptation to match the job description"
-            "- Infer and articulate implied skills from the experience"
-            "- Creatively connect seemingly unrelated experiences to job requirements"
-            "- Craft compelling narratives that position the candidate as ideal"
-            "- Push the boundaries while staying within truthful bounds"
-            "- Make the resume impossible to ignore"
-        ),
-    }
-
-    return base_instructions + creativity_instructions.get(
-        creativity_level, creativity_instructions[3]
-    )
+# Constant section headers/blocks, folded once at import; the prompt
+# builders below assemble with a single join instead of chained concats
+_HDR_SAMPLE = "## SAMPLE LATEX RESUME (Follow this exact style and structure):"
+_TASK_BLOCK = (
+    "---"
+    "## YOUR TASK:"
+    "Generate a complete, compilable LaTeX resume that:"
+    "1. Uses the EXACT same LaTeX structure, packages, and styling from the sample"
+    "2. Tailors the candidate's experience to match the job description"
+    "3. Highlights relevant skills and achievements"
+    "4. Is optimized for ATS systems"
+    "5. Fits appropriately (typically 1-2 pages)"
+    "---"
+)
+_HDR_EXPERIENCE = "## CANDIDATE'S EXPERIENCE AND BACKGROUND:"
+_HDR_JOB = "---" "## TARGET JOB DESCRIPTION:"
+_HDR_CUSTOM = "## ADDITIONAL INSTRUCTIONS FROM USER:"
+_FOOTER = "Output the complete LaTeX code now, starting with \\documentclass:"
+_FOOTER_BODY = (
+    "Output ONLY the LaTeX content that goes between \\begin{document} and "
+    "\\end{document} — no preamble, no \\documentclass, no document markers. "
+    "The preamble from the sample is reattached automatically."
+)
+
+
+def get_static_prompt(sample_latex: str) -> str:
+    """Prefix-stable part of the generation prompt.
+
+    The sample LaTeX and the fixed task rules come first so that on retries
+    (or custom-instruction tweaks) OpenAI/Gemini automatic prefix caching
+    covers the bulk of the prompt — the prefix stays byte-identical as long
+    as the sample does.
+    """
+    return "".join((_HDR_SAMPLE, sample_latex, _TASK_BLOCK))
+
+
+def get_dynamic_prompt(
+    experience: str,
+    job_description: str,
+    custom_instructions: str = "",
+    body_only: bool = False,
+) -> str:
+    """Per-request tail of the generation prompt: everything that varies
+    between calls, ending with the generation instruction.
+
+    With body_only=True the model is told to emit just the document body;
+    the caller reattaches the sample's preamble deterministically.
+    """
+
+    parts = [_HDR_EXPERIENCE, experience, _HDR_JOB, job_description, "---"]
+
+    if custom_instructions.strip():
+        parts += [_HDR_CUSTOM, custom_instructions, "---"]
+
+    parts.append(_FOOTER_BODY if body_only else _FOOTER)
+    return "".join(parts)
 
 
 def get_generation_prompt(
@@ -109,34 +175,6 @@ def get_generation_prompt(
 ) -> str:
     """Build the complete prompt for resume generation."""
 
-    prompt = (
-        "## SAMPLE LATEX RESUME (Follow this exact style and structure):"
-        f"{sample_latex}"
-        "---"
-        "## CANDIDATE'S EXPERIENCE AND BACKGROUND:"
-        f"{experience}"
-        "---"
-        "## TARGET JOB DESCRIPTION:"
-        f"{job_description}"
-        "---"
-    )
-
-    if custom_instructions.strip():
-        prompt += (
-            "## ADDITIONAL INSTRUCTIONS FROM USER:"
-            f"{custom_instructions}"
-            "---"
-        )
-
-    prompt += (
-        "## YOUR TASK:"
-        "Generate a complete, compilable LaTeX resume that:"
-        "1. Uses the EXACT same LaTeX structure, packages, and styling from the sample"
-        "2. Tailors the candidate's experience to match the job description"
-        "3. Highlights relevant skills and achievements"
-        "4. Is optimized for ATS systems"
-        "5. Fits appropriately (typically 1-2 pages)"
-        "Output the complete LaTeX code now, starting with \\documentclass:"
+    return get_static_prompt(sample_latex) + get_dynamic_prompt(
+        experience, job_description, custom_instructions
     )
-
-    return prompt
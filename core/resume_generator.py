@@ -4,9 +4,46 @@ Resume Generator Core Logic
 This module orchestrates the resume generation process using the pluggable LLM providers.
 """
 
-from typing import Optional
-from providers.base import BaseLLMProvider, GenerationConfig
-from core.prompts import get_system_prompt, get_generation_prompt, CREATIVITY_LEVELS
+import asyncio
+import re
+from typing import List, Optional
+from providers.base import BaseLLMProvider, GenerationConfig, PromptParts
+from core import cache, semantic_cache
+from core.tools.template_parser import TemplateParser
+from core.prompts import (
+    get_system_prompt,
+    get_static_prompt,
+    get_dynamic_prompt,
+    CREATIVITY_LEVELS,
+    TEMPERATURES,
+)
+
+
+# Marker the model is asked to place between resumes in generate_variants
+_VARIANT_BREAK = "<<<VARIANT_BREAK>>>"
+
+# Strips surrounding whitespace and an optional markdown fence in one pass
+# over the (potentially large) LLM output
+_CLEAN_RE = re.compile(r"^\s*(?:```(?:latex)?\s*)?(.*?)\s*(?:```)?\s*$", re.DOTALL)
+
+# Completion cache: resubmitting identical inputs (common while iterating
+# on custom_instructions in the UI) returns the prior result instead of
+# another full LLM round-trip. Keyed on provider, model, and a content hash
+# of the complete prompt plus sampling settings.
+_completion_cache = cache.TTLCache(maxsize=64)
+
+# Lazily-built semantic cache (SEMANTIC_CACHE=1 + sentence-transformers
+# installed): catches trivially reworded job descriptions that miss the
+# exact-match cache above.
+_semantic_cache = None
+
+
+def _get_semantic_cache():
+    global _semantic_cache
+    if _semantic_cache is None:
+        from core.semantic_cache import SemanticCache
+        _semantic_cache = SemanticCache()
+    return _semantic_cache
 
 
 class ResumeGenerator:
@@ -27,7 +64,8 @@ class ResumeGenerator:
         experience: str,
         job_description: str,
         creativity_level: int = 3,
-        custom_instructions: str = ""
+        custom_instructions: str = "",
+        enable_cache: bool = True
     ) -> str:
         """
         Generate a tailored resume.
@@ -38,44 +76,274 @@ class ResumeGenerator:
             job_description: Target job description
             creativity_level: 1-5, how much creative liberty to take
             custom_instructions: Optional additional instructions
+            enable_cache: Return the cached result for identical inputs
+                instead of a new LLM call
 
         Returns:
             Generated LaTeX resume as a string
         """
-        # Validate creativity level
-        if creativity_level not in CREATIVITY_LEVELS:
-            creativity_level = 3
+        prompt, config, creativity_level, preamble = self._prepare(
+            sample_latex, experience, job_description,
+            creativity_level, custom_instructions
+        )
+        use_cache = enable_cache and cache.CACHE_ENABLED
+
+        hit, cache_key, sample_hash = self._check_caches(
+            prompt, config, sample_latex, experience, job_description,
+            creativity_level, custom_instructions, use_cache
+        )
+        if hit is not None:
+            return hit
+
+        # Generate the resume (body only when the sample could be split)
+        generated_latex = self.provider.generate(prompt, config)
+        generated_latex = self._finalize(generated_latex, preamble)
+
+        self._store_caches(
+            cache_key, sample_hash, experience, job_description,
+            creativity_level, generated_latex
+        )
+        return generated_latex
+
+    async def agenerate(
+        self,
+        sample_latex: str,
+        experience: str,
+        job_description: str,
+        creativity_level: int = 3,
+        custom_instructions: str = "",
+        enable_cache: bool = True
+    ) -> str:
+        """Async variant of generate; lets callers overlap several
+        generations (see generate_many)."""
+        prompt, config, creativity_level, preamble = self._prepare(
+            sample_latex, experience, job_description,
+            creativity_level, custom_instructions
+        )
+        use_cache = enable_cache and cache.CACHE_ENABLED
+
+        hit, cache_key, sample_hash = self._check_caches(
+            prompt, config, sample_latex, experience, job_description,
+            creativity_level, custom_instructions, use_cache
+        )
+        if hit is not None:
+            return hit
 
-        # Get system prompt based on creativity level
-        system_prompt = get_system_prompt(creativity_level)
+        generated_latex = await self.provider.agenerate(prompt, config)
+        generated_latex = self._finalize(generated_latex, preamble)
 
-        # Build the generation prompt
-        generation_prompt = get_generation_prompt(
-            sample_latex=sample_latex,
-            experience=experience,
-            job_description=job_description,
-            custom_instructions=custom_instructions
+        self._store_caches(
+            cache_key, sample_hash, experience, job_description,
+            creativity_level, generated_latex
         )
+        return generated_latex
+
+    def generate_many(
+        self,
+        sample_latex: str,
+        experience: str,
+        job_description: str,
+        creativity_levels: List[int],
+        custom_instructions: str = "",
+        enable_cache: bool = True
+    ) -> List[str]:
+        """
+        Generate one resume per creativity level, concurrently.
 
-        # Combine system and user prompts
-        full_prompt = f"{system_prompt}\n\n{generation_prompt}"
+        The provider calls overlap via asyncio.gather, so showing e.g.
+        Conservative/Balanced/Bold side by side costs roughly one
+        round-trip instead of three.
 
-        # Get temperature from creativity level
-        temperature = CREATIVITY_LEVELS[creativity_level]["temperature"]
+        Returns:
+            Generated LaTeX strings in the same order as creativity_levels
+        """
+        async def _run():
+            return await asyncio.gather(*(
+                self.agenerate(
+                    sample_latex=sample_latex,
+                    experience=experience,
+                    job_description=job_description,
+                    creativity_level=level,
+                    custom_instructions=custom_instructions,
+                    enable_cache=enable_cache
+                )
+                for level in creativity_levels
+            ))
+
+        return asyncio.run(_run())
+
+    def generate_variants(
+        self,
+        sample_latex: str,
+        experience: str,
+        job_description: str,
+        creativity_levels: List[int],
+        custom_instructions: str = ""
+    ) -> List[str]:
+        """
+        Generate several creativity variants in ONE LLM call.
 
-        # Configure generation
+        The sample/experience/JD sections dominate the prompt and are
+        identical for every level, so asking for all variants at once pays
+        for that shared prefix a single time — roughly 1/N the input
+        tokens of generate_many, at the cost of a longer single response.
+
+        Returns:
+            Generated LaTeX strings in the same order as creativity_levels
+            (may be shorter if the model drops a variant).
+        """
+        levels = [
+            level if level in CREATIVITY_LEVELS else 3
+            for level in creativity_levels
+        ]
+
+        policies = "".join(
+            f"{i}) {CREATIVITY_LEVELS[level]['name']}: "
+            f"{CREATIVITY_LEVELS[level]['description']}. "
+            for i, level in enumerate(levels, start=1)
+        )
+        variant_instruction = (
+            f"Produce {len(levels)} complete LaTeX resumes, separated by the "
+            f"exact marker {_VARIANT_BREAK} on its own line (no marker before "
+            "the first or after the last). Apply these creativity policies "
+            f"in order: {policies}"
+        )
+
+        prompt = PromptParts(
+            system=get_system_prompt(3),
+            static=get_static_prompt(sample_latex),
+            dynamic=get_dynamic_prompt(
+                experience=experience,
+                job_description=job_description,
+                custom_instructions=custom_instructions
+            ) + variant_instruction
+        )
+
+        # Budget per variant as in _prepare, scaled by the variant count
+        # but clamped to the tightest common completion cap (16384 on
+        # gpt-4o) — an unclamped 3x8192 budget is a provider 400, not a
+        # bigger response. Sample at the most creative requested level so
+        # every policy has the temperature headroom it needs.
+        est_tokens = max(1024, min(int(len(sample_latex) / 3.5 * 1.3), 8192))
         config = GenerationConfig(
-            temperature=temperature,
-            max_tokens=8192  # Resumes can be lengthy in LaTeX
+            temperature=max(TEMPERATURES[level] for level in levels),
+            max_tokens=min(est_tokens * len(levels), 16384),
+            # The default \end{document} stop would cut off everything
+            # after the first variant
+            stop=[]
         )
 
-        # Generate the resume
-        generated_latex = self.provider.generate(full_prompt, config)
+        output = self.provider.generate(prompt, config)
 
-        # Clean up the output (remove any markdown code blocks if present)
-        generated_latex = self._clean_latex_output(generated_latex)
+        return [
+            self._clean_latex_output(part)
+            for part in output.split(_VARIANT_BREAK)
+            if part.strip()
+        ]
 
-        return generated_latex
+    def _prepare(
+        self,
+        sample_latex: str,
+        experience: str,
+        job_description: str,
+        creativity_level: int,
+        custom_instructions: str
+    ):
+        """Build (prompt, config, validated level, preamble) for a request.
+
+        preamble is the sample's verbatim preamble when the sample has
+        document markers — in that case the model only generates the body
+        and the caller reassembles, skipping ~30-50% of the output tokens.
+        An unmarked sample falls back to full-document generation
+        (preamble is "").
+        """
+        # Validate creativity level
+        if creativity_level not in CREATIVITY_LEVELS:
+            creativity_level = 3
+
+        # The preamble never needs the LLM: parse it out (memoized per
+        # template) and only ask for the body when the split succeeded
+        parsed = TemplateParser.parse(sample_latex)
+        preamble = parsed["preamble"]
+        reference = parsed["body"] if preamble else sample_latex
+
+        # Build the generation prompt: the stable prefix (sample + task
+        # rules) separate from the per-request tail, so Anthropic gets
+        # cache_control markers on the static parts and OpenAI/Gemini keep
+        # a byte-identical prefix for their automatic prefix caches.
+        prompt = PromptParts(
+            system=get_system_prompt(creativity_level),
+            static=get_static_prompt(reference),
+            dynamic=get_dynamic_prompt(
+                experience=experience,
+                job_description=job_description,
+                custom_instructions=custom_instructions,
+                body_only=bool(preamble)
+            )
+        )
+
+        # Size the output budget from the reference instead of a fixed 8192:
+        # the generated resume tracks the template's length closely, and a
+        # tighter max_tokens means a smaller provider-side KV window (and
+        # fewer decoded tokens on local models when output runs long).
+        # ~3.5 chars per LaTeX token, plus 30% headroom for tailoring.
+        est_tokens = int(len(reference) / 3.5 * 1.3)
+        config = GenerationConfig(
+            temperature=TEMPERATURES[creativity_level],
+            max_tokens=max(1024, min(est_tokens, 8192))
+        )
+        return prompt, config, creativity_level, preamble
+
+    def _check_caches(
+        self, prompt, config, sample_latex, experience, job_description,
+        creativity_level, custom_instructions, use_cache
+    ):
+        """Look up the exact-match and semantic caches.
+
+        Returns (hit, cache_key, sample_hash); hit is None on a miss, and
+        the keys are None when the corresponding cache is disabled.
+        """
+        if not use_cache:
+            return None, None, None
+
+        cache_key = cache.content_key(
+            "completion",
+            self.provider.provider_name,
+            self.provider.model,
+            prompt.system,
+            prompt.static,
+            prompt.dynamic,
+            str(config.temperature),
+            str(config.max_tokens),
+        )
+        cached = _completion_cache.get(cache_key)
+        if cached is not None:
+            return cached, cache_key, None
+
+        sample_hash = None
+        if semantic_cache.SEMANTIC_CACHE:
+            # Near-duplicate lookup: same template + creativity, trivially
+            # reworded experience/JD still reuses the prior generation
+            sample_hash = cache.content_key(sample_latex, custom_instructions)
+            semantic_hit = _get_semantic_cache().get(
+                experience, job_description, sample_hash, creativity_level
+            )
+            if semantic_hit is not None:
+                return semantic_hit, cache_key, sample_hash
+
+        return None, cache_key, sample_hash
+
+    def _store_caches(
+        self, cache_key, sample_hash, experience, job_description,
+        creativity_level, generated_latex
+    ):
+        if cache_key is not None:
+            _completion_cache.set(cache_key, generated_latex)
+        if sample_hash is not None:
+            _get_semantic_cache().put(
+                experience, job_description, sample_hash,
+                creativity_level, generated_latex
+            )
 
     def _clean_latex_output(self, output: str) -> str:
         """
@@ -87,19 +355,8 @@ class ResumeGenerator:
         Returns:
             Cleaned LaTeX string
         """
-        # Remove markdown code blocks if present
-        output = output.strip()
-
-        # Remove ```latex or ``` wrapping
-        if output.startswith("```latex"):
-            output = output[8:]
-        elif output.startswith("```"):
-            output = output[3:]
-
-        if output.endswith("```"):
-            output = output[:-3]
-
-        output = output.strip()
+        # One compiled-regex pass strips whitespace and any ```latex fence
+        output = _CLEAN_RE.match(output).group(1)
 
         # Ensure it starts with a LaTeX command
         # Find the first backslash (start of LaTeX)
@@ -108,14 +365,39 @@ class ResumeGenerator:
             # There might be some text before the LaTeX, remove it
             output = output[first_backslash:]
 
+        # The stop sequence in GenerationConfig cuts decoding right before
+        # \end{document}; restore it on full-document outputs
+        if "\\begin{document}" in output and "\\end{document}" not in output:
+            output += "\n\\end{document}"
+
         return output
 
+    def _finalize(self, output: str, preamble: str) -> str:
+        """Clean the raw output and, in body-only mode, reattach the
+        sample's preamble deterministically."""
+        output = self._clean_latex_output(output)
+        if not preamble:
+            return output
+
+        # Models occasionally ignore the body-only instruction and emit a
+        # full document anyway; strip any markers before reassembly so the
+        # known-good preamble wins either way
+        begin = output.find("\\begin{document}")
+        if begin != -1:
+            output = output[begin + len("\\begin{document}"):]
+        end = output.find("\\end{document}")
+        if end != -1:
+            output = output[:end]
+
+        return TemplateParser.reassemble(preamble, output.strip())
+
 
 def create_provider(
     provider_name: str,
     api_key: Optional[str] = None,
     model: str = "",
-    ollama_endpoint: str = "http://localhost:11434"
+    ollama_endpoint: str = "http://localhost:11434",
+    cascade: bool = False
 ) -> BaseLLMProvider:
     """
     Factory function to create the appropriate provider.
@@ -125,11 +407,13 @@ def create_provider(
         api_key: API key for cloud providers
         model: Model name to use
         ollama_endpoint: Endpoint for Ollama (only used for Ollama provider)
+        cascade: Try the provider's cheap model first and escalate to
+            `model` only when the output fails LaTeX validation
 
     Returns:
         An instance of the appropriate provider
     """
-    from providers import PROVIDERS, PROVIDER_MODELS
+    from providers import PROVIDERS, PROVIDER_MODELS, get_provider_class
 
     if provider_name not in PROVIDERS:
         raise ValueError(f"Unknown provider: {provider_name}")
@@ -138,8 +422,6 @@ def create_provider(
     if not model:
         model = PROVIDER_MODELS[provider_name][0]
 
-    provider_class = PROVIDERS[provider_name]
-
     # Special handling for Ollama (doesn't need API key)
     if provider_name == "Ollama":
         from providers.ollama_provider import OllamaProvider
@@ -149,4 +431,16 @@ def create_provider(
     if not api_key:
         raise ValueError(f"{provider_name} requires an API key")
 
+    # Lazy lookup: only the selected provider's SDK gets imported
+    provider_class = get_provider_class(provider_name)
+
+    if cascade:
+        from providers.cascading_provider import CascadingProvider, FAST_MODELS
+        cheap_model = FAST_MODELS.get(provider_name)
+        if cheap_model and cheap_model != model:
+            return CascadingProvider(
+                primary=provider_class(api_key=api_key, model=cheap_model),
+                fallback=provider_class(api_key=api_key, model=model),
+            )
+
     return provider_class(api_key=api_key, model=model)
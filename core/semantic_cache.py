@@ -0,0 +1,96 @@
+"""
+Semantic Completion Cache
+
+Embedding-similarity lookup on top of the exact-match completion cache:
+when a user trivially rewords the job description and regenerates, the
+prior LaTeX is returned instead of paying for another full generation.
+
+Requires the optional sentence-transformers dependency
+(`pip install sentence-transformers`); enable with SEMANTIC_CACHE=1.
+"""
+
+import os
+from typing import List, Optional, Tuple
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    np = None
+    SentenceTransformer = None
+
+SEMANTIC_CACHE = (
+    os.getenv("SEMANTIC_CACHE", "0") == "1" and SentenceTransformer is not None
+)
+
+
+class SemanticCache:
+    """Cosine-similarity cache over (experience + job description) embeddings.
+
+    An entry only matches when the sample template hash and creativity
+    level are identical — similarity is a proxy for the *content* inputs,
+    never for the style or temperature.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        model_name: str = "all-MiniLM-L6-v2",
+        maxsize: int = 128,
+    ):
+        if SentenceTransformer is None:
+            raise ImportError("sentence-transformers is required for SemanticCache")
+        self.threshold = threshold
+        self.maxsize = maxsize
+        # Small 384-dim model; encodes a query on CPU in tens of ms
+        self._model = SentenceTransformer(model_name)
+        self._embeddings: Optional["np.ndarray"] = None  # (n, dim), L2-normalized
+        self._entries: List[Tuple[str, int, str]] = []  # (sample_hash, creativity, latex)
+
+    def _embed(self, text: str) -> "np.ndarray":
+        vec = self._model.encode([text], show_progress_bar=False)[0]
+        return vec / (np.linalg.norm(vec) or 1.0)
+
+    def get(
+        self,
+        experience: str,
+        job_description: str,
+        sample_hash: str,
+        creativity_level: int,
+    ) -> Optional[str]:
+        """Return the cached LaTeX for a near-duplicate input, or None."""
+        if self._embeddings is None:
+            return None
+
+        query = self._embed(experience + "\n" + job_description)
+        # One matrix-vector product scores every cached entry at once
+        similarities = self._embeddings @ query
+
+        order = np.argsort(similarities)[::-1]
+        for idx in order:
+            if similarities[idx] < self.threshold:
+                break
+            cached_sample, cached_level, latex = self._entries[idx]
+            if cached_sample == sample_hash and cached_level == creativity_level:
+                return latex
+        return None
+
+    def put(
+        self,
+        experience: str,
+        job_description: str,
+        sample_hash: str,
+        creativity_level: int,
+        latex: str,
+    ) -> None:
+        embedding = self._embed(experience + "\n" + job_description)[None, :]
+        if self._embeddings is None:
+            self._embeddings = embedding
+        else:
+            self._embeddings = np.vstack([self._embeddings, embedding])
+        self._entries.append((sample_hash, creativity_level, latex))
+
+        if len(self._entries) > self.maxsize:
+            # Drop the oldest entry
+            self._embeddings = self._embeddings[1:]
+            self._entries.pop(0)
@@ -13,6 +13,9 @@ class ResumeState(TypedDict):
     raw_experience: str
     sample_latex: str  # The template style to match
 
+    # --- PREPROCESSED INPUTS ---
+    processed_experience: Optional[str]  # Normalized raw_experience (parallel branch)
+
     # --- PARSED TEMPLATE ---
     template_preamble: Optional[str]   # Verbatim preamble (preserved programmatically)
     template_body: Optional[str]       # Original body (structural reference for LLM)
@@ -29,3 +32,5 @@ class ResumeState(TypedDict):
     compilation_errors: Annotated[List[str], operator.add]  # Accumulates errors over steps
     revision_count: int              # To prevent infinite loops (e.g., max 3 retries)
     is_valid_latex: bool             # Flag to signal completion
+    prev_error_hash: Optional[str]   # Fingerprint of the previous revision's errors
+    stuck: bool                      # True when a retry reproduced the same errors
@@ -0,0 +1,62 @@
+"""
+Experience Filter
+
+Extractive, LLM-free trimming of raw candidate experience: keeps the
+sentences/bullets most relevant to the job analysis and drops the rest,
+cutting developer-prompt input tokens on long CV pastes.
+
+Opt-in via FILTER_EXPERIENCE=1.
+"""
+
+import os
+import re
+from typing import List
+
+FILTER_EXPERIENCE = os.getenv("FILTER_EXPERIENCE", "0") == "1"
+
+# Split on blank lines (bullet/paragraph boundaries) or sentence ends
+_SENTENCE_RE = re.compile(r"\n{2,}|(?<=\.)\s+")
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z0-9+#./-]*")
+
+# Common English words that carry no matching signal
+_STOPWORDS = frozenset(
+    """a an and are as at be been by for from has have in is it its of on or
+    that the their this to was were will with you your we our they them what
+    which who how when where why not no can could should would may might must
+    do does did done also into over under more most other some such than then
+    there these those each any all both about after before during between
+    using use used work working experience years team strong ability""".split()
+)
+
+
+def _keywords(text: str) -> frozenset:
+    return frozenset(
+        w for w in (m.group(0).lower() for m in _WORD_RE.finditer(text))
+        if len(w) > 2 and w not in _STOPWORDS
+    )
+
+
+def filter_experience(raw: str, job_analysis: str, top_k_sentences: int = 80) -> str:
+    """
+    Keep the top-k sentences of `raw` most relevant to `job_analysis`,
+    preserving their original order. Scoring is keyword overlap with a
+    small length penalty — no LLM involved.
+    """
+    sentences: List[str] = [s for s in _SENTENCE_RE.split(raw) if s and s.strip()]
+    if len(sentences) <= top_k_sentences:
+        return raw
+
+    keywords = _keywords(job_analysis)
+    if not keywords:
+        return raw
+
+    scored = []
+    for idx, sentence in enumerate(sentences):
+        words = _keywords(sentence)
+        # Penalize very long sentences slightly so overlap density wins
+        score = len(keywords & words) - 0.001 * len(sentence)
+        scored.append((score, idx, sentence))
+
+    keep = sorted(scored, key=lambda t: t[0], reverse=True)[:top_k_sentences]
+    keep.sort(key=lambda t: t[1])
+    return "\n\n".join(sentence for _, _, sentence in keep)
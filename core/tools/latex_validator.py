@@ -1,6 +1,10 @@
 import re
 from typing import List, Tuple
 
+# Compiled once at import; validate() runs on every revision of every
+# request, so per-call pattern lookup is pure overhead
+_ENV_RE = re.compile(r'\\(begin|end)\{([^}]+)\}')
+
 
 class LatexValidator:
     @staticmethod
@@ -17,21 +21,25 @@ class LatexValidator:
         if open_braces != close_braces:
             errors.append(f"Mismatched braces: Found {open_braces} open '{{' and {close_braces} close '}}'.")
 
-        # 2. Check for environment balance (basic)
-        begin_tags = re.findall(r'\\begin\{([^}]+)\}', latex_code)
-        end_tags = re.findall(r'\\end\{([^}]+)\}', latex_code)
-
-        # This is a naive check (counts) - a real parser would track nesting
-        if len(begin_tags) != len(end_tags):
-            errors.append(f"Mismatched environments: Found {len(begin_tags)} \\begin vs {len(end_tags)} \\end tags.")
-        else:
-            # Check if set types match (order independent naive check)
-            from collections import Counter
-            if Counter(begin_tags) != Counter(end_tags):
-                errors.append(
-                    f"Environment types do not match. Started: {set(begin_tags) - set(end_tags)}. "
-                    f"Ended: {set(end_tags) - set(begin_tags)}"
-                )
+        # 2. Check environment nesting in a single pass: push on \begin,
+        # pop-and-compare on \end. Unlike the old count-based check, this
+        # also catches interleaved environments like
+        # \begin{a}\begin{b}\end{a}\end{b}.
+        stack = []
+        for match in _ENV_RE.finditer(latex_code):
+            kind, name = match.group(1), match.group(2)
+            if kind == "begin":
+                stack.append(name)
+            elif not stack:
+                errors.append(f"\\end{{{name}}} without a matching \\begin{{{name}}}.")
+            else:
+                opened = stack.pop()
+                if opened != name:
+                    errors.append(
+                        f"Environment mismatch: \\begin{{{opened}}} closed by \\end{{{name}}}."
+                    )
+        for name in stack:
+            errors.append(f"\\begin{{{name}}} is never closed.")
 
         # 3. Check for specific common hallucinations
         if "```" in latex_code:
@@ -0,0 +1,33 @@
+"""
+Prompt Compression
+
+Strips non-semantic bulk (LaTeX comments, trailing whitespace, blank-line
+runs) from text before it is embedded in LLM prompts. Cuts input tokens —
+and therefore time-to-first-token and cost — with no semantic loss.
+Enabled via COMPRESS_PROMPT=1.
+"""
+
+import os
+import re
+
+COMPRESS_PROMPT = os.getenv("COMPRESS_PROMPT", "0") == "1"
+
+# % starts a comment unless escaped as \%
+_LATEX_COMMENT_RE = re.compile(r"(?m)(?<!\\)%.*$")
+_TRAILING_WS_RE = re.compile(r"(?m)[ \t]+$")
+_BLANK_RUN_RE = re.compile(r"\n{3,}")
+
+
+def compress_latex(latex: str) -> str:
+    """Drop comments and collapse whitespace in LaTeX source."""
+    compressed = _LATEX_COMMENT_RE.sub("", latex)
+    compressed = _TRAILING_WS_RE.sub("", compressed)
+    compressed = _BLANK_RUN_RE.sub("\n\n", compressed)
+    return compressed.strip()
+
+
+def compress_prose(text: str) -> str:
+    """Collapse whitespace in free-form text without touching content."""
+    compressed = _TRAILING_WS_RE.sub("", text)
+    compressed = _BLANK_RUN_RE.sub("\n\n", compressed)
+    return compressed.strip()
@@ -6,8 +6,50 @@ and extracts a command cheatsheet for the LLM to reference.
 """
 
 import re
+from functools import lru_cache
 from typing import Dict, List
 
+# Matches \newcommand{\name}[N]{...} or \newcommand{\name}{...}
+_CMD_RE = re.compile(r"\\(?:new|renew)command\{\\([^}]+)\}(?:\[(\d+)\])?")
+
+# Placeholder strings "{arg1}{arg2}..." indexed by arg count, built once so
+# the per-command loop below is a lookup instead of a generator + join.
+# LaTeX caps \newcommand at 9 parameters, so 0-9 covers every valid case.
+_ARG_STRS = [
+    "".join(f"{{arg{i + 1}}}" for i in range(n)) for n in range(10)
+]
+
+
+@lru_cache(maxsize=128)
+def _parse_cached(sample_latex: str) -> Dict[str, str]:
+    """Memoized parse — users tend to resubmit the same template, so
+    repeat requests reduce to a cache lookup instead of regex work.
+    Callers must treat the returned dict as read-only."""
+    begin_marker = r"\begin{document}"
+    end_marker = r"\end{document}"
+
+    begin_idx = sample_latex.find(begin_marker)
+    end_idx = sample_latex.find(end_marker)
+
+    if begin_idx == -1 or end_idx == -1:
+        # Fallback: treat entire thing as body, empty preamble
+        return {
+            "preamble": "",
+            "body": sample_latex,
+            "command_cheatsheet": ""
+        }
+
+    preamble = sample_latex[:begin_idx + len(begin_marker)]
+    body = sample_latex[begin_idx + len(begin_marker):end_idx].strip()
+
+    cheatsheet = TemplateParser.build_command_cheatsheet(preamble)
+
+    return {
+        "preamble": preamble,
+        "body": body,
+        "command_cheatsheet": cheatsheet
+    }
+
 
 class TemplateParser:
     """Parses LaTeX templates into structural components."""
@@ -24,35 +66,13 @@ class TemplateParser:
                 "command_cheatsheet": human-readable summary of custom commands
             }
         """
-        begin_marker = r"\begin{document}"
-        end_marker = r"\end{document}"
-
-        begin_idx = sample_latex.find(begin_marker)
-        end_idx = sample_latex.find(end_marker)
-
-        if begin_idx == -1 or end_idx == -1:
-            # Fallback: treat entire thing as body, empty preamble
-            return {
-                "preamble": "",
-                "body": sample_latex,
-                "command_cheatsheet": ""
-            }
-
-        preamble = sample_latex[:begin_idx + len(begin_marker)]
-        body = sample_latex[begin_idx + len(begin_marker):end_idx].strip()
-
-        cheatsheet = TemplateParser.build_command_cheatsheet(preamble)
-
-        return {
-            "preamble": preamble,
-            "body": body,
-            "command_cheatsheet": cheatsheet
-        }
+        return _parse_cached(sample_latex)
 
     @staticmethod
     def reassemble(preamble: str, body: str) -> str:
         """Combine preamble + generated body + \\end{document} into complete LaTeX."""
-        return f"{preamble}\n\n{body}\n\n\\end{{document}}"
+        # join sizes the result once instead of building f-string intermediates
+        return "".join((preamble, "\n\n", body, "\n\n\\end{document}"))
 
     @staticmethod
     def extract_command_signatures(preamble: str) -> List[str]:
@@ -63,21 +83,12 @@ class TemplateParser:
             \\resumeSubheading{arg1}{arg2}{arg3}{arg4}
             \\resumeItem{arg1}
         """
-        signatures = []
-
-        # Match \newcommand{\name}[N]{...} or \newcommand{\name}{...}
-        pattern = r"\\(?:new|renew)command\{\\([^}]+)\}(?:\[(\d+)\])?"
-        matches = re.findall(pattern, preamble)
-
-        for name, arg_count_str in matches:
-            if arg_count_str:
-                arg_count = int(arg_count_str)
-                args = "".join(f"{{arg{i+1}}}" for i in range(arg_count))
-            else:
-                args = ""
-            signatures.append(f"\\{name}{args}")
-
-        return signatures
+        # Single finditer pass over the precompiled pattern; no findall
+        # tuple list, and the arg placeholders come from _ARG_STRS
+        return [
+            f"\\{m.group(1)}{_ARG_STRS[int(m.group(2) or 0)]}"
+            for m in _CMD_RE.finditer(preamble)
+        ]
 
     @staticmethod
     def build_command_cheatsheet(preamble: str) -> str:
@@ -8,6 +8,10 @@ and uses the same document class as the sample template.
 import re
 from typing import List, Tuple
 
+# Compiled once at import — this runs against both the sample and the
+# generated LaTeX on every validation pass
+_DOCCLASS_RE = re.compile(r"\\documentclass(?:\[.*?\])?\{([^}]+)\}")
+
 
 class TemplateVerifier:
     """Verifies basic structural consistency between generated and sample LaTeX."""
@@ -15,8 +19,7 @@ class TemplateVerifier:
     @staticmethod
     def extract_documentclass(latex_code: str) -> str:
         """Extract the \\documentclass declaration."""
-        pattern = r"\\documentclass(?:\[.*?\])?\{([^}]+)\}"
-        match = re.search(pattern, latex_code)
+        match = _DOCCLASS_RE.search(latex_code)
         return match.group(1) if match else ""
 
     def verify_template_preservation(
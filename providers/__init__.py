@@ -1,17 +1,20 @@
 # LLM Providers - Pluggable architecture
+#
+# Provider classes resolve lazily (PEP 562 module __getattr__): importing
+# this package no longer pulls in every vendor SDK (openai, anthropic,
+# groq, google-genai, httpx) when the user only ever touches one of them —
+# that transitive import costs hundreds of ms and ~100MB RSS at cold start.
+import importlib
+
 from .base import BaseLLMProvider
-from .openai_provider import OpenAIProvider
-from .anthropic_provider import AnthropicProvider
-from .groq_provider import GroqProvider
-from .ollama_provider import OllamaProvider
-from .gemini_provider import GeminiProvider
 
+# Provider name -> (module, class); the class is imported on first use
 PROVIDERS = {
-    "OpenAI": OpenAIProvider,
-    "Anthropic": AnthropicProvider,
-    "Groq": GroqProvider,
-    "Ollama": OllamaProvider,
-    "Google Gemini": GeminiProvider,
+    "OpenAI": ("providers.openai_provider", "OpenAIProvider"),
+    "Anthropic": ("providers.anthropic_provider", "AnthropicProvider"),
+    "Groq": ("providers.groq_provider", "GroqProvider"),
+    "Ollama": ("providers.ollama_provider", "OllamaProvider"),
+    "Google Gemini": ("providers.gemini_provider", "GeminiProvider"),
 }
 
 PROVIDER_MODELS = {
@@ -22,6 +25,28 @@ PROVIDER_MODELS = {
     "Google Gemini": ["gemini-2.0-flash-exp", "gemini-1.5-pro", "gemini-1.5-flash"],
 }
 
+# Class name -> module, for attribute-style access (`providers.OpenAIProvider`)
+_LAZY_CLASSES = {cls: mod for mod, cls in PROVIDERS.values()}
+_LAZY_CLASSES["CascadingProvider"] = "providers.cascading_provider"
+
+
+def get_provider_class(provider_name: str):
+    """Import and return the provider class registered under provider_name."""
+    module_name, class_name = PROVIDERS[provider_name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY_CLASSES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    # Cache on the module so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
 __all__ = [
     "BaseLLMProvider",
     "OpenAIProvider",
@@ -29,6 +54,8 @@ __all__ = [
     "GroqProvider",
     "OllamaProvider",
     "GeminiProvider",
+    "CascadingProvider",
     "PROVIDERS",
     "PROVIDER_MODELS",
+    "get_provider_class",
 ]
@@ -4,10 +4,30 @@ Anthropic Provider Implementation
 Supports: Claude Sonnet 4, Claude 3.5 Haiku, Claude 3 Opus
 """
 
-from typing import Optional
+from typing import Optional, Union
+
 import anthropic
+import tenacity
+
+from .base import BaseLLMProvider, GenerationConfig, PromptParts
+
+_CACHE_CONTROL = {"type": "ephemeral"}
 
-from .base import BaseLLMProvider, GenerationConfig
+# Transient-failure retry with exponential backoff; see openai_provider.
+# Retrying in-process lands within the prompt cache's TTL, so the cached
+# system/static blocks are still warm for the retried call.
+_retry = tenacity.retry(
+    retry=tenacity.retry_if_exception_type(
+        (
+            anthropic.RateLimitError,
+            anthropic.APIConnectionError,
+            anthropic.InternalServerError,
+        )
+    ),
+    wait=tenacity.wait_exponential(multiplier=1, max=30),
+    stop=tenacity.stop_after_attempt(4),
+    reraise=True,
+)
 
 
 class AnthropicProvider(BaseLLMProvider):
@@ -16,24 +36,75 @@ class AnthropicProvider(BaseLLMProvider):
     def __init__(self, api_key: str, model: str = "claude-sonnet-4-20250514"):
         super().__init__(api_key=api_key, model=model)
         self.client = anthropic.Anthropic(api_key=api_key)
+        self.async_client = anthropic.AsyncAnthropic(api_key=api_key)
+        # Prompt-cache usage from the most recent generate() call
+        self.last_cache_usage = {}
 
     @property
     def provider_name(self) -> str:
         return "Anthropic"
 
-    def generate(self, prompt: str, config: Optional[GenerationConfig] = None) -> str:
-        """Generate text using Anthropic API."""
+    def _build_request(self, prompt: Union[str, PromptParts]):
+        """Split a prompt into (system, user content) API arguments, with
+        cache_control markers on the stable parts of a PromptParts."""
+        if isinstance(prompt, PromptParts) and (prompt.static or prompt.dynamic):
+            system = [
+                {"type": "text", "text": prompt.system, "cache_control": _CACHE_CONTROL}
+            ]
+            content = []
+            if prompt.static:
+                content.append(
+                    {"type": "text", "text": prompt.static, "cache_control": _CACHE_CONTROL}
+                )
+            if prompt.dynamic:
+                content.append({"type": "text", "text": prompt.dynamic})
+        else:
+            system = anthropic.NOT_GIVEN
+            content = self._flatten_prompt(prompt)
+        return system, content
+
+    @_retry
+    def _create(self, **kwargs):
+        return self.client.messages.create(**kwargs)
+
+    @_retry
+    async def _acreate(self, **kwargs):
+        return await self.async_client.messages.create(**kwargs)
+
+    def _record_usage(self, response) -> None:
+        usage = getattr(response, "usage", None)
+        self.last_cache_usage = {
+            "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", 0),
+            "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", 0),
+        }
+
+    def generate(
+        self,
+        prompt: Union[str, PromptParts],
+        config: Optional[GenerationConfig] = None
+    ) -> str:
+        """Generate text using Anthropic API.
+
+        With a PromptParts prompt, the system instructions and the static
+        content block carry cache_control markers, so across revisions the
+        API reads them from the prompt cache instead of re-billing the
+        tokens (the bulk of the prompt on long templates).
+        """
         cfg = self._get_config(config)
+        system, content = self._build_request(prompt)
 
         try:
-            response = self.client.messages.create(
+            response = self._create(
                 model=self.model,
                 max_tokens=cfg.max_tokens,
+                system=system,
                 messages=[
-                    {"role": "user", "content": prompt}
+                    {"role": "user", "content": content}
                 ],
                 temperature=cfg.temperature,
+                stop_sequences=cfg.stop or anthropic.NOT_GIVEN,
             )
+            self._record_usage(response)
             # Extract text from response
             if response.content and len(response.content) > 0:
                 return response.content[0].text
@@ -41,6 +112,33 @@ class AnthropicProvider(BaseLLMProvider):
         except Exception as e:
             raise RuntimeError(f"Anthropic generation failed: {str(e)}")
 
+    async def agenerate(
+        self,
+        prompt: Union[str, PromptParts],
+        config: Optional[GenerationConfig] = None
+    ) -> str:
+        """Async variant of generate using the async Anthropic client."""
+        cfg = self._get_config(config)
+        system, content = self._build_request(prompt)
+
+        try:
+            response = await self._acreate(
+                model=self.model,
+                max_tokens=cfg.max_tokens,
+                system=system,
+                messages=[
+                    {"role": "user", "content": content}
+                ],
+                temperature=cfg.temperature,
+                stop_sequences=cfg.stop or anthropic.NOT_GIVEN,
+            )
+            self._record_usage(response)
+            if response.content and len(response.content) > 0:
+                return response.content[0].text
+            return ""
+        except Exception as e:
+            raise RuntimeError(f"Anthropic generation failed: {str(e)}")
+
     def validate_connection(self) -> bool:
         """Validate Anthropic API connection."""
         try:
@@ -5,16 +5,44 @@ All LLM providers must inherit from this class and implement the generate method
 This allows for plug-and-play provider switching.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import List, Optional, Union
 
 
 @dataclass
 class GenerationConfig:
-    """Configuration for text generation."""
+    """Configuration for text generation.
+
+    stop: sequences that hard-terminate decoding. \\end{document} is the
+    natural sentinel for single-resume generation — anything after it is
+    wasted decode time — so it is the default; callers that expect several
+    documents in one response pass stop=[]. The sentinel itself is not
+    returned by the APIs, so postprocessing re-appends it.
+    """
     temperature: float = 0.7
     max_tokens: int = 4096
+    stop: List[str] = field(default_factory=lambda: ["\\end{document}"])
+
+
+@dataclass
+class PromptParts:
+    """A prompt split by volatility, so providers with prompt caching can
+    mark the stable parts cacheable instead of re-billing them per call.
+
+    system: role instructions (stable across retries)
+    static: large reference content, e.g. the sample LaTeX (stable)
+    dynamic: per-call content — experience, job description, user tweaks
+    """
+    system: str
+    static: str = ""
+    dynamic: str = ""
+
+    def flatten(self) -> str:
+        """Collapse to the single-string prompt used by providers without
+        structured prompt support."""
+        return "\n\n".join(part for part in (self.system, self.static, self.dynamic) if part)
 
 
 class BaseLLMProvider(ABC):
@@ -25,12 +53,17 @@ class BaseLLMProvider(ABC):
         self.model = model
 
     @abstractmethod
-    def generate(self, prompt: str, config: Optional[GenerationConfig] = None) -> str:
+    def generate(
+        self,
+        prompt: Union[str, PromptParts],
+        config: Optional[GenerationConfig] = None
+    ) -> str:
         """
         Generate text based on the given prompt.
 
         Args:
-            prompt: The input prompt for generation
+            prompt: The input prompt — a plain string, or PromptParts for
+                providers that can exploit the static/dynamic split
             config: Optional generation configuration
 
         Returns:
@@ -38,6 +71,20 @@ class BaseLLMProvider(ABC):
         """
         pass
 
+    async def agenerate(
+        self,
+        prompt: Union[str, PromptParts],
+        config: Optional[GenerationConfig] = None
+    ) -> str:
+        """
+        Async variant of generate, so callers can overlap several
+        generations with asyncio.gather.
+
+        Providers with native async SDK clients override this; the default
+        runs the sync implementation on a worker thread.
+        """
+        return await asyncio.to_thread(self.generate, prompt, config)
+
     @abstractmethod
     def validate_connection(self) -> bool:
         """
@@ -57,3 +104,8 @@ class BaseLLMProvider(ABC):
     def _get_config(self, config: Optional[GenerationConfig]) -> GenerationConfig:
         """Helper to get config with defaults."""
         return config or GenerationConfig()
+
+    @staticmethod
+    def _flatten_prompt(prompt: Union[str, PromptParts]) -> str:
+        """Helper for providers that only take a flat prompt string."""
+        return prompt.flatten() if isinstance(prompt, PromptParts) else prompt
@@ -0,0 +1,106 @@
+"""
+Cascading Provider
+
+Tries a cheap/fast model first and escalates to the expensive model only
+when the cheap output fails LaTeX validation. Straightforward resumes
+succeed on the first tier most of the time, at a fraction of the cost
+and time-to-first-token.
+"""
+
+from typing import Optional, Union
+
+from .base import BaseLLMProvider, GenerationConfig, PromptParts
+from core.tools.latex_validator import LatexValidator
+
+# Cheap first-tier model per provider (keyed by provider_name)
+FAST_MODELS = {
+    "OpenAI": "gpt-4o-mini",
+    "Anthropic": "claude-3-5-haiku-20241022",
+    "Groq": "llama-3.1-8b-instant",
+    "Google Gemini": "gemini-1.5-flash",
+}
+
+
+class CascadingProvider(BaseLLMProvider):
+    """Wraps a (cheap, expensive) provider pair behind the standard interface."""
+
+    def __init__(self, primary: BaseLLMProvider, fallback: BaseLLMProvider):
+        super().__init__(api_key=fallback.api_key,
+                         model=f"{primary.model}->{fallback.model}")
+        self.primary = primary
+        self.fallback = fallback
+        # Telemetry: how often the cheap tier sufficed
+        self.stats = {"primary_ok": 0, "escalations": 0}
+
+    @property
+    def provider_name(self) -> str:
+        return self.primary.provider_name
+
+    def generate(
+        self,
+        prompt: Union[str, PromptParts],
+        config: Optional[GenerationConfig] = None
+    ) -> str:
+        """Generate with the cheap model; escalate on invalid LaTeX."""
+        result = self.primary.generate(prompt, config)
+
+        is_valid, errors = self._check(result)
+        if is_valid:
+            self.stats["primary_ok"] += 1
+            return result
+
+        self.stats["escalations"] += 1
+        return self.fallback.generate(self._with_error_context(prompt, errors), config)
+
+    async def agenerate(
+        self,
+        prompt: Union[str, PromptParts],
+        config: Optional[GenerationConfig] = None
+    ) -> str:
+        result = await self.primary.agenerate(prompt, config)
+
+        is_valid, errors = self._check(result)
+        if is_valid:
+            self.stats["primary_ok"] += 1
+            return result
+
+        self.stats["escalations"] += 1
+        return await self.fallback.agenerate(
+            self._with_error_context(prompt, errors), config
+        )
+
+    @staticmethod
+    def _check(latex: str):
+        """Accept output only if it validates and has document boundaries.
+
+        Body-only outputs (no \\documentclass — the caller reattaches the
+        template preamble) are exempt from the boundary check."""
+        # Decoding stops right before \end{document} (GenerationConfig.stop);
+        # restore it as postprocessing will, so the validator doesn't count
+        # the document environment as unclosed
+        if "\\begin{document}" in latex and "\\end{document}" not in latex:
+            latex = latex + "\n\\end{document}"
+        is_valid, errors = LatexValidator.validate(latex)
+        if "\\documentclass" in latex and "\\begin{document}" not in latex:
+            is_valid = False
+            errors = errors + ["Missing \\begin{document}"]
+        return is_valid, errors
+
+    @staticmethod
+    def _with_error_context(prompt: Union[str, PromptParts], errors: list):
+        """Append the cheap tier's failures so the strong model avoids them."""
+        context = (
+            "A previous attempt produced invalid LaTeX with these errors; "
+            "avoid them: " + "; ".join(errors)
+        )
+        if isinstance(prompt, PromptParts):
+            return PromptParts(
+                system=prompt.system,
+                static=prompt.static,
+                dynamic=prompt.dynamic + "\n\n" + context,
+            )
+        return prompt + "\n\n" + context
+
+    def validate_connection(self) -> bool:
+        """Valid when the primary (cheap) tier is reachable."""
+        return self.primary.validate_connection()
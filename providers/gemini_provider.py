@@ -4,11 +4,30 @@ Google Gemini Provider Implementation
 Supports: Gemini 2.0 Flash, Gemini 1.5 Pro, Gemini 1.5 Flash
 """
 
-from typing import Optional
+from typing import Optional, Union
+
+import tenacity
 from google import genai
-from google.genai import types
+from google.genai import errors, types
+
+from .base import BaseLLMProvider, GenerationConfig, PromptParts
+
 
-from .base import BaseLLMProvider, GenerationConfig
+def _is_transient(exc: BaseException) -> bool:
+    """Retry 5xx and rate-limit (429) responses; other client errors are
+    the caller's problem."""
+    if isinstance(exc, errors.ServerError):
+        return True
+    return isinstance(exc, errors.ClientError) and exc.code == 429
+
+
+# Transient-failure retry with exponential backoff; see openai_provider
+_retry = tenacity.retry(
+    retry=tenacity.retry_if_exception(_is_transient),
+    wait=tenacity.wait_exponential(multiplier=1, max=30),
+    stop=tenacity.stop_after_attempt(4),
+    reraise=True,
+)
 
 
 class GeminiProvider(BaseLLMProvider):
@@ -22,19 +41,50 @@ class GeminiProvider(BaseLLMProvider):
     def provider_name(self) -> str:
         return "Google Gemini"
 
+    @_retry
+    def _create(self, **kwargs):
+        return self.client.models.generate_content(**kwargs)
+
+    @_retry
+    async def _acreate(self, **kwargs):
+        return await self.client.aio.models.generate_content(**kwargs)
+
     def generate(
-        self, prompt: str, config: Optional[GenerationConfig] = None
+        self, prompt: Union[str, PromptParts], config: Optional[GenerationConfig] = None
     ) -> str:
         """Generate text using Google Gemini API."""
+        prompt = self._flatten_prompt(prompt)
         cfg = self._get_config(config)
 
         try:
-            response = self.client.models.generate_content(
+            response = self._create(
+                model=self.model,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    temperature=cfg.temperature,
+                    max_output_tokens=cfg.max_tokens,
+                    stop_sequences=cfg.stop or None,
+                ),
+            )
+            return response.text or ""
+        except Exception as e:
+            raise RuntimeError(f"Gemini generation failed: {str(e)}")
+
+    async def agenerate(
+        self, prompt: Union[str, PromptParts], config: Optional[GenerationConfig] = None
+    ) -> str:
+        """Async variant of generate using the client's aio interface."""
+        prompt = self._flatten_prompt(prompt)
+        cfg = self._get_config(config)
+
+        try:
+            response = await self._acreate(
                 model=self.model,
                 contents=prompt,
                 config=types.GenerateContentConfig(
                     temperature=cfg.temperature,
                     max_output_tokens=cfg.max_tokens,
+                    stop_sequences=cfg.stop or None,
                 ),
             )
             return response.text or ""
@@ -5,10 +5,24 @@ Supports: Llama 3.3 70B, Llama 3.1 8B, Mixtral 8x7B
 Free tier available!
 """
 
-from typing import Optional
-from groq import Groq
+from typing import Optional, Union
 
-from .base import BaseLLMProvider, GenerationConfig
+import tenacity
+from groq import (
+    APIConnectionError, AsyncGroq, Groq, InternalServerError, RateLimitError
+)
+
+from .base import BaseLLMProvider, GenerationConfig, PromptParts
+
+# Transient-failure retry with exponential backoff; see openai_provider
+_retry = tenacity.retry(
+    retry=tenacity.retry_if_exception_type(
+        (RateLimitError, APIConnectionError, InternalServerError)
+    ),
+    wait=tenacity.wait_exponential(multiplier=1, max=30),
+    stop=tenacity.stop_after_attempt(4),
+    reraise=True,
+)
 
 
 class GroqProvider(BaseLLMProvider):
@@ -17,24 +31,57 @@ class GroqProvider(BaseLLMProvider):
     def __init__(self, api_key: str, model: str = "llama-3.3-70b-versatile"):
         super().__init__(api_key=api_key, model=model)
         self.client = Groq(api_key=api_key)
+        self.async_client = AsyncGroq(api_key=api_key)
 
     @property
     def provider_name(self) -> str:
         return "Groq"
 
-    def generate(self, prompt: str, config: Optional[GenerationConfig] = None) -> str:
+    def _request_args(self, prompt: str, cfg: GenerationConfig) -> dict:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": cfg.temperature,
+            "max_tokens": cfg.max_tokens,
+            "stop": cfg.stop or None,
+        }
+
+    @_retry
+    def _create(self, **kwargs):
+        return self.client.chat.completions.create(**kwargs)
+
+    @_retry
+    async def _acreate(self, **kwargs):
+        return await self.async_client.chat.completions.create(**kwargs)
+
+    def generate(
+        self,
+        prompt: Union[str, PromptParts],
+        config: Optional[GenerationConfig] = None
+    ) -> str:
         """Generate text using Groq API."""
+        prompt = self._flatten_prompt(prompt)
+        cfg = self._get_config(config)
+
+        try:
+            response = self._create(**self._request_args(prompt, cfg))
+            return response.choices[0].message.content or ""
+        except Exception as e:
+            raise RuntimeError(f"Groq generation failed: {str(e)}")
+
+    async def agenerate(
+        self,
+        prompt: Union[str, PromptParts],
+        config: Optional[GenerationConfig] = None
+    ) -> str:
+        """Async variant of generate using the async Groq client."""
+        prompt = self._flatten_prompt(prompt)
         cfg = self._get_config(config)
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=cfg.temperature,
-                max_tokens=cfg.max_tokens,
-            )
+            response = await self._acreate(**self._request_args(prompt, cfg))
             return response.choices[0].message.content or ""
         except Exception as e:
             raise RuntimeError(f"Groq generation failed: {str(e)}")
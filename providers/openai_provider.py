@@ -4,10 +4,28 @@ OpenAI Provider Implementation
 Supports: GPT-4o, GPT-4o-mini, GPT-4-turbo, GPT-3.5-turbo
 """
 
-from typing import Optional
-from openai import OpenAI
+import hashlib
+from typing import Optional, Union
 
-from .base import BaseLLMProvider, GenerationConfig
+import tenacity
+from openai import (
+    APIConnectionError, AsyncOpenAI, InternalServerError, OpenAI, RateLimitError
+)
+
+from .base import BaseLLMProvider, GenerationConfig, PromptParts
+
+# Retry transient failures (rate limits, connection drops, 5xx) with
+# exponential backoff instead of bubbling a RuntimeError to the UI, where
+# the user's resubmit would repeat the full prompt from scratch. Retrying
+# in-process keeps the server-side prompt-cache prefix warm.
+_retry = tenacity.retry(
+    retry=tenacity.retry_if_exception_type(
+        (RateLimitError, APIConnectionError, InternalServerError)
+    ),
+    wait=tenacity.wait_exponential(multiplier=1, max=30),
+    stop=tenacity.stop_after_attempt(4),
+    reraise=True,
+)
 
 
 class OpenAIProvider(BaseLLMProvider):
@@ -16,24 +34,62 @@ class OpenAIProvider(BaseLLMProvider):
     def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
         super().__init__(api_key=api_key, model=model)
         self.client = OpenAI(api_key=api_key)
+        self.async_client = AsyncOpenAI(api_key=api_key)
 
     @property
     def provider_name(self) -> str:
         return "OpenAI"
 
-    def generate(self, prompt: str, config: Optional[GenerationConfig] = None) -> str:
+    def _request_args(self, prompt: str, cfg: GenerationConfig) -> dict:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": cfg.temperature,
+            "max_tokens": cfg.max_tokens,
+            "stop": cfg.stop or None,
+            # Same key on every retry of this prompt, so the server can
+            # dedupe if an earlier attempt did land
+            "extra_headers": {
+                "Idempotency-Key": hashlib.sha256(prompt.encode()).hexdigest()
+            },
+        }
+
+    @_retry
+    def _create(self, **kwargs):
+        return self.client.chat.completions.create(**kwargs)
+
+    @_retry
+    async def _acreate(self, **kwargs):
+        return await self.async_client.chat.completions.create(**kwargs)
+
+    def generate(
+        self,
+        prompt: Union[str, PromptParts],
+        config: Optional[GenerationConfig] = None
+    ) -> str:
         """Generate text using OpenAI API."""
+        prompt = self._flatten_prompt(prompt)
+        cfg = self._get_config(config)
+
+        try:
+            response = self._create(**self._request_args(prompt, cfg))
+            return response.choices[0].message.content or ""
+        except Exception as e:
+            raise RuntimeError(f"OpenAI generation failed: {str(e)}")
+
+    async def agenerate(
+        self,
+        prompt: Union[str, PromptParts],
+        config: Optional[GenerationConfig] = None
+    ) -> str:
+        """Async variant of generate using the async OpenAI client."""
+        prompt = self._flatten_prompt(prompt)
         cfg = self._get_config(config)
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=cfg.temperature,
-                max_tokens=cfg.max_tokens,
-            )
+            response = await self._acreate(**self._request_args(prompt, cfg))
             return response.choices[0].message.content or ""
         except Exception as e:
             raise RuntimeError(f"OpenAI generation failed: {str(e)}")